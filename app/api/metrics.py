@@ -0,0 +1,42 @@
+import secrets
+
+from fastapi import APIRouter, HTTPException, Request, Response, status
+
+from app import utils
+from app.core import metrics
+from app.core.config import config
+from app.core.manager import AsyncDatabaseManager
+
+router: APIRouter = APIRouter(tags=["System"])
+
+
+@router.get(
+    "/metrics",
+    summary="Prometheus metrics",
+    description="Prometheus text exposition. Requires METRICS_TOKEN as a bearer token; not found while it is unset.",
+    include_in_schema=False
+)
+async def get_metrics(request: Request) -> Response:
+    """
+    Export request, SQL, S3 and Redis latency, cache and pool metrics.
+    """
+    if not config.METRICS_TOKEN:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Not Found"
+        )
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not secrets.compare_digest(token, config.METRICS_TOKEN):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid metrics token"
+        )
+
+    db_manager: AsyncDatabaseManager = request.app.state.db_manager
+    collector = metrics.StatsCollector(
+        pool_stats=db_manager.pool_status,
+        token_cache_stats=utils.token.cache.stats,
+        replica_available=lambda: db_manager.replica_available if db_manager.replica_engine is not None else None
+    )
+    body, content_type = metrics.render(collector)
+    return Response(content=body, media_type=content_type)
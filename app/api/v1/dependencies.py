@@ -5,12 +5,11 @@ Contains common dependency functions for routers.
 """
 from typing import AsyncGenerator
 
-import jose
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import APIKeyHeader
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app import utils
+from app import services, validators
 from app.core.config import config
 from app.core.manager import AsyncDatabaseManager
 
@@ -19,6 +18,11 @@ async def get_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
     """
     Get database session.
     
+    The session is the request's unit of work: repo functions only
+    execute and flush, and the service commits once before returning.
+    Committing here would be too late, since dependency teardown runs
+    after the response is sent; uncommitted work is rolled back on close.
+    
     Args:
         request: HTTP request with app state
         
@@ -30,10 +34,40 @@ async def get_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
-def verify_access_token(request: Request) -> dict | None:
+async def get_read_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Get database session for read-only endpoints.
+    
+    Uses the read replica when one is configured and within
+    DB_REPLICA_MAX_LAG; otherwise, or while the requested card is pinned
+    after a write, falls back to the primary. Never write through it.
+    
+    Args:
+        request: HTTP request with app state and card id path parameter
+        
+    Yields:
+        AsyncSession: Session for read operations
+    """
+    db_manager: AsyncDatabaseManager = request.app.state.db_manager
+    replica: bool = db_manager.replica_available
+    card_id: str | None = request.path_params.get("id")
+    # path params are validated after dependencies run
+    if replica and card_id is not None and card_id.isdigit():
+        replica = not await services.card_cache.is_pinned(
+            card_id=int(card_id),
+            redis_manager=request.app.state.redis_manager
+        )
+    async for session in db_manager.get_async_session(replica=replica):
+        yield session
+
+
+async def verify_access_token(request: Request) -> dict:
     """
     Verify access token from cookie.
     
+    Async so it does not hop to the threadpool; decoded tokens are cached
+    by utils.token, see validators.auth.require_access_token.
+    
     Args:
         request: HTTP request
         
@@ -44,20 +78,7 @@ def verify_access_token(request: Request) -> dict | None:
         HTTPException: 401 if token is missing
         HTTPException: 403 if token is invalid
     """
-    token: str | None = request.cookies.get("Authorization")
-    if not token:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, 
-            detail="Not authenticated"
-        )
-    try:
-        payload = utils.token.verify(token.split(" ")[1])
-        return payload
-    except jose.JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN, 
-            detail="Invalid token"
-        )
+    return validators.auth.require_access_token(request)
 
 
 async def verify_admin(
@@ -2,8 +2,10 @@ from fastapi import APIRouter
 
 from .cards import router as cards_router
 from .codes import router as codes_router
+from .system import router as system_router
 
 router: APIRouter = APIRouter(tags=["Admin"])
 
 router.include_router(cards_router)
-router.include_router(codes_router)
\ No newline at end of file
+router.include_router(codes_router)
+router.include_router(system_router)
\ No newline at end of file
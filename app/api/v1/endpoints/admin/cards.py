@@ -1,8 +1,12 @@
-from fastapi import APIRouter, Request, Depends, HTTPException, status
+from datetime import datetime
+
+from fastapi import APIRouter, Request, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.v1.dependencies import get_session, verify_admin
-from app import schemas, services
+from app import schemas, services, utils, validators
+from app.core.config import config
 
 router: APIRouter = APIRouter(prefix="/cards")
 
@@ -17,3 +21,112 @@ async def create_card(
     session: AsyncSession = Depends(get_session)
 ) -> schemas.cards.OnCreate:
     return await services.cards.create(card=card, session=session)
+
+
+@router.post(
+    "/bulk/",
+    response_class=StreamingResponse,
+    summary="Create cards in bulk",
+    description="Creates a batch of cards with activation codes in one transaction "
+                "and returns card IDs with plaintext codes as CSV or NDJSON. Admin only.",
+    responses={
+        200: {
+            "description": "Card IDs and activation codes in input order",
+            "content": {media_type: {} for media_type in utils.export.MEDIA_TYPES.values()}
+        }
+    }
+)
+async def create_cards_bulk(
+    bulk: schemas.cards.BulkIn,
+    format: schemas.cards.BulkFormat = Query("csv", description="Response format"),
+    session: AsyncSession = Depends(get_session)
+) -> StreamingResponse:
+    """
+    Provision a batch of cards.
+
+    - **cards**: card data, up to BULK_MAX_CARDS per request
+
+    Plaintext codes are returned only once, store the response.
+    """
+    rows: list[dict] = await services.cards.create_many(bulk=bulk, session=session)
+    return StreamingResponse(
+        utils.export.serialize(format, ["card_id", "code"], rows),
+        media_type=utils.export.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="cards.{format}"'}
+    )
+
+
+@router.post(
+    "/bulk/actions/",
+    response_model=schemas.cards.BulkActionOut,
+    summary="Bulk card action",
+    description="Regenerates codes, activates, deactivates or deletes many cards at once. "
+                "Targets are given as card IDs or as a filter. Admin only.",
+    responses={
+        400: {"description": "Filter matches too many cards"},
+        422: {"description": "Neither or both of card_ids and filter given"}
+    }
+)
+async def bulk_action(
+    bulk: schemas.cards.BulkActionIn,
+    request: Request,
+    session: AsyncSession = Depends(get_session)
+) -> schemas.cards.BulkActionOut:
+    """
+    Apply an action to many cards.
+
+    - **action**: regenerate_codes, activate, deactivate or delete
+    - **card_ids**: target card IDs
+    - **filter**: target every card matching the filter instead
+
+    Unknown card IDs are reported as not_found. Deleted cards' S3 objects
+    are removed in the background by the outbox worker.
+    """
+    card_ids: list[int] = await validators.cards.require_bulk_targets(bulk=bulk, session=session)
+
+    return await services.cards.apply_bulk(
+        bulk=bulk,
+        card_ids=card_ids,
+        session=session,
+        redis_manager=request.app.state.redis_manager
+    )
+
+
+@router.get(
+    "/",
+    response_model=schemas.cards.Page,
+    summary="List cards",
+    description="Lists cards ordered by ID using keyset pagination. "
+                "Pass next_cursor of the previous page as after_id. Admin only."
+)
+async def list_cards(
+    after_id: int | None = Query(None, ge=0, description="Cursor: last card ID of the previous page"),
+    limit: int = Query(
+        config.ADMIN_PAGE_SIZE, ge=1, le=config.ADMIN_MAX_PAGE_SIZE, description="Page size"
+    ),
+    is_active: bool | None = Query(None, description="Filter by activation state"),
+    city: str | None = Query(None, max_length=20, description="Filter by city"),
+    created_from: datetime | None = Query(None, description="Created at or after"),
+    created_to: datetime | None = Query(None, description="Created before"),
+    with_stats: bool = Query(False, description="Include social count and avatar presence"),
+    session: AsyncSession = Depends(get_session)
+) -> schemas.cards.Page:
+    """
+    List cards page by page.
+
+    Deep pages cost the same as the first one: the cursor is an index
+    seek on the card ID instead of an OFFSET.
+    """
+    filters = schemas.cards.Filter(
+        is_active=is_active,
+        city=city,
+        created_from=created_from,
+        created_to=created_to
+    )
+    return await services.cards.get_page(
+        after_id=after_id,
+        limit=limit,
+        filters=filters,
+        with_stats=with_stats,
+        session=session
+    )
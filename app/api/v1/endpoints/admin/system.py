@@ -0,0 +1,104 @@
+import asyncio
+import os
+
+from fastapi import APIRouter, HTTPException, Path, Request, status
+from fastapi.responses import PlainTextResponse
+
+from app import schemas, utils
+from app.core.config import config
+from app.core.manager import AsyncDatabaseManager
+
+router: APIRouter = APIRouter(prefix="/system")
+
+
+@router.get(
+    "/pool/",
+    response_model=schemas.system.PoolStatus,
+    summary="Database pool status",
+    description="Connection pool metrics of the worker process that answers. Admin only."
+)
+async def get_pool_status(request: Request) -> schemas.system.PoolStatus:
+    """
+    Get database connection pool status.
+
+    Every worker has its own pool, repeated calls may hit different workers.
+    """
+    db_manager: AsyncDatabaseManager = request.app.state.db_manager
+    return schemas.system.PoolStatus(**db_manager.pool_status())
+
+
+
+@router.post(
+    "/profiler/window/",
+    response_model=schemas.system.ProfileWindowOut,
+    summary="Profile next requests",
+    description="Arms the sampling profiler for the next N requests handled by the answering worker. "
+                "Replaces a window that is still open. Requires PROFILER_ENABLED. Admin only."
+)
+async def arm_profiler_window(data: schemas.system.ProfileWindowIn) -> schemas.system.ProfileWindowOut:
+    """
+    Profile a window of requests on this worker.
+
+    Single requests are profiled by sending the profile header together
+    with X-Admin-Key instead.
+    """
+    if not config.PROFILER_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Profiler is disabled"
+        )
+    profile: utils.profiler.Profile = utils.profiler.arm(
+        requests=data.requests,
+        path_prefix=data.path_prefix
+    )
+    return schemas.system.ProfileWindowOut(
+        profile_id=profile.id,
+        requests=data.requests,
+        path_prefix=data.path_prefix,
+        pid=os.getpid()
+    )
+
+
+@router.delete(
+    "/profiler/window/",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Close profiling window",
+    description="Stops profiling further requests on the answering worker. Admin only."
+)
+async def close_profiler_window() -> None:
+    """
+    Close the profiling window of this worker.
+    """
+    utils.profiler.window = None
+
+
+@router.get(
+    "/profiles/{profile_id}/",
+    response_class=PlainTextResponse,
+    summary="Get profile",
+    description="Folded stacks for flamegraph.pl or speedscope. Admin only.",
+    responses={404: {"description": "Profile not found"}}
+)
+async def get_profile(
+    profile_id: str = Path(..., pattern=r"^\d+-\d+-[0-9a-f]+$", description="Profile ID")
+) -> PlainTextResponse:
+    """
+    Get a stored profile.
+
+    Window profiles are rewritten after every profiled request, so they
+    can be fetched before the window closes.
+    """
+    path: str = utils.profiler.profile_path(profile_id)
+    try:
+        folded: str = await asyncio.to_thread(_read, path)
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    return PlainTextResponse(folded)
+
+
+def _read(path: str) -> str:
+    with open(path) as file:
+        return file.read()
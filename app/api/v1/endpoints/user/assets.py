@@ -1,15 +1,43 @@
-from fastapi import APIRouter, Depends, File, Form, Request, UploadFile
+from fastapi import APIRouter, Depends, Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app import schemas, services, validators
+from app import schemas, services, utils, validators
 from app.api.v1.dependencies import get_session, verify_access_token
+from app.core import models
 from app.s3.client import S3Client
 
 router: APIRouter = APIRouter(prefix="/assets")
 
 
+def multipart_body(**fields: dict) -> dict:
+    # bodies are parsed as a stream, so the form is described for OpenAPI by hand
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                "multipart/form-data": {
+                    "schema": {
+                        "type": "object",
+                        "properties": {
+                            **fields,
+                            "file": {
+                                "type": "string",
+                                "format": "binary",
+                                "description": "Image file (JPEG, PNG)"
+                            },
+                        },
+                        "required": [*fields, "file"],
+                    }
+                }
+            },
+        }
+    }
+
+
 @router.post(
-    "/avatar/", 
+    "/avatar/",
     response_model=schemas.assets.Out,
     summary="Upload avatar",
     description="Uploads or updates card avatar. "
@@ -19,80 +47,111 @@ router: APIRouter = APIRouter(prefix="/assets")
         401: {"description": "Not authenticated"},
         404: {"description": "Card not found"},
         413: {"description": "File too large"}
-    }
+    },
+    openapi_extra=multipart_body()
 )
 async def upload_avatar(
-    request: Request, 
-    file: UploadFile = File(..., description="Image file (JPEG, PNG)"),
+    request: Request,
     token: dict = Depends(verify_access_token),
     session: AsyncSession = Depends(get_session)
 ) -> schemas.assets.Out:
     """
     Upload avatar for card.
-    
+
     - **file**: image in JPEG or PNG format
-    
+
     Overwrites existing avatar if present.
+    The file is decoded before anything is written to S3.
     """
-    validators.assets.validate_image(file)
-    
-    card = await validators.cards.require_card(
-        card_id=token["card_id"], 
+    validators.assets.validate_content_length(request)
+
+    card_id = await validators.cards.require_card_exists(
+        card_id=token["card_id"],
         session=session
     )
-    
+    # ends the read-only transaction, so no pooled connection is held
+    # while the body is received and rendered
+    await session.commit()
+
+    form = utils.multipart.MultipartStream(request)
+    await form.read_fields_until("file")
+    content_type, chunks = await validators.assets.require_image_stream(form.iter_part())
+
     s3_client: S3Client = request.app.state.s3_client
-    
+
     return await services.avatars.upload(
-        card=card, 
-        s3_client=s3_client, 
-        file=file, 
-        session=session
+        card_id=card_id,
+        s3_client=s3_client,
+        content_type=content_type,
+        chunks=chunks,
+        image_pool=request.app.state.image_pool,
+        session=session,
+        redis_manager=request.app.state.redis_manager
     )
 
 
 @router.post(
-    "/logo/", 
+    "/logo/",
     response_model=schemas.assets.Out,
     summary="Upload social icon",
     description="Uploads custom icon for social link. "
-                "Social link must not have an existing icon.",
+                "Social link must not have an existing icon. "
+                "The social_id field must be sent before the file.",
     responses={
         400: {"description": "Invalid file type or icon already exists"},
         401: {"description": "Not authenticated"},
         404: {"description": "Social link not found"},
-        413: {"description": "File too large"}
-    }
+        413: {"description": "File too large"},
+        422: {"description": "Invalid social_id"}
+    },
+    openapi_extra=multipart_body(
+        social_id={"type": "integer", "minimum": 1, "description": "Social link ID"}
+    )
 )
 async def upload_logo(
-    request: Request, 
-    social_id: int = Form(..., ge=1, description="Social link ID"),
-    file: UploadFile = File(..., description="Image file (JPEG, PNG)"),
+    request: Request,
     token: dict = Depends(verify_access_token),
     session: AsyncSession = Depends(get_session)
 ) -> schemas.assets.Out:
     """
     Upload custom icon for social link.
-    
+
     - **social_id**: social link ID
     - **file**: image in JPEG or PNG format
-    
+
     Cannot upload icon if one already exists.
+    The file is decoded before anything is written to S3.
     """
-    validators.assets.validate_image(file)
-    
+    validators.assets.validate_content_length(request)
+
+    form = utils.multipart.MultipartStream(request)
+    try:
+        fields = schemas.assets.LogoForm.model_validate(
+            await form.read_fields_until("file")
+        )
+    except ValidationError as e:
+        raise RequestValidationError(e.errors())
+
     social: models.CardSocial = await validators.socials.require_social(
-        card_id=token["card_id"], 
-        social_id=social_id, 
+        card_id=token["card_id"],
+        social_id=fields.social_id,
         session=session
     )
     validators.socials.require_no_icon(social)
-    
+    # ends the read-only transaction, so no pooled connection is held
+    # while the body is received and rendered
+    await session.commit()
+
+    content_type, chunks = await validators.assets.require_image_stream(form.iter_part())
+
     s3_client: S3Client = request.app.state.s3_client
-    
+
     return await services.logos.upload(
-        social=social, 
-        s3_client=s3_client, 
-        file=file, 
-        session=session
-    )
\ No newline at end of file
+        social=social,
+        s3_client=s3_client,
+        content_type=content_type,
+        chunks=chunks,
+        image_pool=request.app.state.image_pool,
+        session=session,
+        redis_manager=request.app.state.redis_manager
+    )
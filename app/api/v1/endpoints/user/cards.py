@@ -1,30 +1,80 @@
-from fastapi import APIRouter, Depends, Path, Request
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, Path, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app import schemas, services, validators
-from app.api.v1.dependencies import get_session, verify_access_token
+from app import schemas, services, utils, validators
+from app.api.v1.dependencies import get_read_session, get_session, verify_access_token
 
 router: APIRouter = APIRouter(prefix="/cards")
 
+async def _render_card(
+    request: Request,
+    response: Response,
+    card_id: int,
+    session: AsyncSession
+) -> schemas.cards.Out | Response:
+    """
+    Render card for GET endpoints.
+    
+    Serves from cache when possible and answers conditional requests
+    (If-None-Match / If-Modified-Since) with 304 without building the card.
+    """
+    cached, cache_version = await services.card_cache.get(
+        card_id=card_id,
+        redis_manager=request.app.state.redis_manager
+    )
+
+    updated_at: datetime | None = None
+    if cached:
+        updated_at = services.card_cache.get_updated_at(cached)
+    elif utils.conditional.has_validators(request):
+        updated_at = await validators.cards.require_card_version(card_id=card_id, session=session)
+
+    if updated_at:
+        etag, last_modified = utils.conditional.build(card_id, updated_at)
+        headers: dict[str, str] = utils.conditional.headers(etag, last_modified)
+        if utils.conditional.is_not_modified(request, etag, last_modified):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        if cached:
+            return Response(content=cached, media_type="application/json", headers=headers)
+
+    card = await validators.cards.require_full_card(card_id=card_id, session=session)
+    
+    card_out: schemas.cards.Out = await services.cards.get(
+        card=card,
+        s3_client=request.app.state.s3_client,
+        redis_manager=request.app.state.redis_manager,
+        cache_version=cache_version
+    )
+    etag, last_modified = utils.conditional.build(card_id, card_out.updated_at)
+    response.headers.update(utils.conditional.headers(etag, last_modified))
+    return card_out
+
+
 @router.get(
     "/me/", 
     response_model=schemas.cards.Out,
     summary="Get my card",
-    description="Returns full card information including social links and avatar.",
+    description="Returns full card information including social links and avatar. "
+                "Supports conditional requests via ETag and Last-Modified.",
+    responses={
+        304: {"description": "Card not modified"}
+    }
 )
 async def get_me(
     request: Request,
+    response: Response,
     token: dict = Depends(verify_access_token),
     session: AsyncSession = Depends(get_session)
 ) -> schemas.cards.Out:
     """
     Get my card.
     """
-    card = await validators.cards.require_card(card_id=token["card_id"], session=session)
-    
-    return await services.cards.get(
-        card=card,
-        s3_client=request.app.state.s3_client,
+    return await _render_card(
+        request=request,
+        response=response,
+        card_id=token["card_id"],
         session=session
     )
 
@@ -32,26 +82,28 @@ async def get_me(
     "/{id}/", 
     response_model=schemas.cards.Out,
     summary="Get card",
-    description="Returns full card information including social links and avatar.",
+    description="Returns full card information including social links and avatar. "
+                "Supports conditional requests via ETag and Last-Modified.",
     responses={
+        304: {"description": "Card not modified"},
         404: {"description": "Card not found"}
     }
 )
 async def get_card(
     request: Request,
+    response: Response,
     id: int = Path(..., ge=1, description="Card ID"),
-    session: AsyncSession = Depends(get_session)
+    session: AsyncSession = Depends(get_read_session)
 ) -> schemas.cards.Out:
     """
     Get card by ID.
     
     - **id**: unique card identifier
     """
-    card = await validators.cards.require_card(card_id=id, session=session)
-    
-    return await services.cards.get(
-        card=card,
-        s3_client=request.app.state.s3_client,
+    return await _render_card(
+        request=request,
+        response=response,
+        card_id=id,
         session=session
     )
 
@@ -87,5 +139,6 @@ async def update_card(
     return await services.cards.update(
         card=card_obj,
         card_update=card,
-        session=session
+        session=session,
+        redis_manager=request.app.state.redis_manager
     )
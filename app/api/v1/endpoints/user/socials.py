@@ -18,6 +18,7 @@ router: APIRouter = APIRouter(prefix="/socials")
     }
 )
 async def create_social(
+    request: Request,
     social: schemas.socials.In,
     session: AsyncSession = Depends(get_session),
     token: dict = Depends(verify_access_token)
@@ -29,15 +30,16 @@ async def create_social(
     - **url**: profile URL
     - **label**: display text
     """
-    card = await validators.cards.require_card(
+    card_id = await validators.cards.require_card_exists(
         card_id=token["card_id"], 
         session=session
     )
     
     return await services.socials.create(
-        card=card, 
+        card_id=card_id, 
         social=social, 
-        session=session
+        session=session,
+        redis_manager=request.app.state.redis_manager
     )
 
 
@@ -64,10 +66,6 @@ async def delete_social(
     
     Also deletes associated icon from S3.
     """
-    card = await validators.cards.require_card(
-        card_id=token["card_id"], 
-        session=session
-    )
     social = await validators.socials.require_social(
         card_id=token["card_id"], 
         social_id=social_id, 
@@ -76,7 +74,6 @@ async def delete_social(
     
     return await services.socials.delete(
         social=social,
-        card=card, 
         session=session, 
-        s3_client=request.app.state.s3_client
+        redis_manager=request.app.state.redis_manager
     )
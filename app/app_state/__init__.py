@@ -1 +1 @@
-from . import db, s3, redis
\ No newline at end of file
+from . import db, images, outbox, s3, redis
\ No newline at end of file
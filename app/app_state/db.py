@@ -1,17 +1,55 @@
+import asyncio
+
+from alembic.script import ScriptDirectory
 from fastapi import FastAPI
+
+from app import migrate
 from app.core.manager import AsyncDatabaseManager
-from app.core.logger import logger
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
 
 
 async def set_up(app: FastAPI) -> None:
     logger.info("Initializing database manager...")
     app.state.db_manager = AsyncDatabaseManager()
     logger.info("Database manager initialized")
-    await app.state.db_manager.create_all_tables()
+    await check_schema(app.state.db_manager)
+
+    if app.state.db_manager.replica_engine is not None:
+        await app.state.db_manager.check_replica()
+        app.state.replica_monitor_stop = asyncio.Event()
+        app.state.replica_monitor = asyncio.create_task(
+            app.state.db_manager.monitor_replica(app.state.replica_monitor_stop)
+        )
+        logger.info("Read replica monitor started")
+
+
+async def check_schema(db_manager: AsyncDatabaseManager) -> None:
+    # a single-row read instead of create_all inspecting the whole catalog
+    # on every worker boot
+    current: str | None = await db_manager.get_schema_revision()
+    script: ScriptDirectory = ScriptDirectory.from_config(migrate.alembic_config())
+    head: str | None = script.get_current_head()
+    if current == head:
+        logger.info("Database schema is at revision %s", current)
+        return
+    if current is None:
+        raise RuntimeError("Database schema is not initialized, run python -m app.migrate")
+    if current in {revision.revision for revision in script.walk_revisions()}:
+        raise RuntimeError(
+            f"Database schema is at revision {current}, expected {head}, run python -m app.migrate"
+        )
+    # a newer deploy has already migrated; its migrations must stay compatible
+    logger.warning("Database schema revision %s is newer than %s", current, head)
 
 
 async def clean_up(app: FastAPI) -> None:
     logger.info("Disposing database engine...")
+    monitor: asyncio.Task = getattr(app.state, "replica_monitor", None)
+    if monitor:
+        app.state.replica_monitor_stop.set()
+        await monitor
     db_manager: AsyncDatabaseManager = getattr(app.state, "db_manager", None)
     if db_manager:
         await db_manager.dispose()
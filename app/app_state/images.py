@@ -0,0 +1,22 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from fastapi import FastAPI
+
+from app.core.config import config
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+async def set_up(app: FastAPI) -> None:
+    logger.info("Starting image process pool...")
+    app.state.image_pool = ProcessPoolExecutor(max_workers=config.IMAGE_WORKERS)
+    logger.info("Image process pool started")
+
+
+async def clean_up(app: FastAPI) -> None:
+    logger.info("Stopping image process pool...")
+    image_pool: ProcessPoolExecutor = getattr(app.state, "image_pool", None)
+    if image_pool:
+        image_pool.shutdown(wait=True, cancel_futures=True)
+    logger.info("Image process pool stopped")
@@ -0,0 +1,30 @@
+import asyncio
+
+from fastapi import FastAPI
+
+from app import services
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+async def set_up(app: FastAPI) -> None:
+    logger.info("Starting S3 outbox worker...")
+    app.state.outbox_stop = asyncio.Event()
+    app.state.outbox_worker = asyncio.create_task(
+        services.outbox.run(
+            db_manager=app.state.db_manager,
+            s3_client=app.state.s3_client,
+            stop=app.state.outbox_stop,
+        )
+    )
+    logger.info("S3 outbox worker started")
+
+
+async def clean_up(app: FastAPI) -> None:
+    logger.info("Stopping S3 outbox worker...")
+    worker: asyncio.Task = getattr(app.state, "outbox_worker", None)
+    if worker:
+        app.state.outbox_stop.set()
+        await worker
+    logger.info("S3 outbox worker stopped")
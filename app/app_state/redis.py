@@ -1,6 +1,8 @@
 from fastapi import FastAPI
 from app.core.redis import RedisManager
-from app.core.logger import logger
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
 
 
 async def set_up(app: FastAPI) -> None:
@@ -2,17 +2,26 @@ from fastapi import FastAPI
 
 from app.s3.client import S3Client
 from app.core.config import config
-from app.core.logger import logger
+from app.core.logger import get_logger
 
-def set_up(app: FastAPI) -> None:
+logger = get_logger(__name__)
+
+async def set_up(app: FastAPI) -> None:
     logger.info("Initializing S3 client...")
     app.state.s3_client = S3Client(
         aws_access_key_id=config.S3_ACCESS_KEY,
         aws_secret_access_key=config.S3_SECRET_KEY,
         endpoint_url=config.S3_DOMAIN,
         bucket_name=config.BUCKET_NAME,
+        redis_manager=getattr(app.state, "redis_manager", None),
     )
+    await app.state.s3_client.connect()
+    logger.info("S3 client initialized")
 
 
-def clean_up(app: FastAPI) -> None:
-    logger.info("S3 client disposed")
\ No newline at end of file
+async def clean_up(app: FastAPI) -> None:
+    logger.info("Closing S3 client...")
+    s3_client: S3Client = getattr(app.state, "s3_client", None)
+    if s3_client:
+        await s3_client.close()
+    logger.info("S3 client disposed")
@@ -1,29 +1,112 @@
+from typing import Literal
+
+from pydantic import BaseModel
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+
+class RateLimit(BaseModel):
+    # path is a route template relative to root_path, e.g. /v1/cards/{id}/
+    method: str
+    path: str
+    key: Literal["ip", "card", "admin"]
+    limit: int
+    window: int
+
+
 class Config(BaseSettings):
     DB_NAME: str
     DB_USER: str
     DB_PASSWORD: str    
     DB_HOST: str
     DB_PORT: int
+    # per process: size the fleet as workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW)
+    # against the server's max_connections
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 10.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # PgBouncer transaction pooling: no server-side prepared statements;
+    # run migrations against Postgres directly
+    DB_PGBOUNCER: bool = False
+
+    # optional streaming replica for public card reads
+    DB_REPLICA_HOST: str | None = None
+    DB_REPLICA_PORT: int | None = None
+    DB_REPLICA_MAX_LAG: float = 5.0
+    DB_REPLICA_CHECK_INTERVAL: float = 5.0
+    # reads of a card stay on the primary this long after a write to it;
+    # keep it above DB_REPLICA_MAX_LAG so a stale replica read is never cached
+    DB_REPLICA_PIN_SECONDS: int = 15
 
     REDIS_HOST: str = "redis"
     REDIS_PORT: int = 6379
 
+    # Prometheus scrapers send it as a bearer token; /metrics answers 404 while unset
+    METRICS_TOKEN: str | None = None
+
+    RATE_LIMIT_ENABLED: bool = True
+    # set to an empty string when the app is not behind Cloudflare
+    RATE_LIMIT_IP_HEADER: str = "CF-Connecting-IP"
+    RATE_LIMITS: list[RateLimit] = [
+        RateLimit(method="POST", path="/v1/codes/redeem/", key="ip", limit=10, window=60),
+        RateLimit(method="GET", path="/v1/cards/{id:int}/", key="ip", limit=120, window=60),
+        RateLimit(method="GET", path="/v1/cards/me/", key="card", limit=120, window=60),
+        RateLimit(method="PATCH", path="/v1/cards/{id:int}/", key="card", limit=30, window=60),
+        RateLimit(method="POST", path="/v1/assets/avatar/", key="card", limit=10, window=60),
+        RateLimit(method="POST", path="/v1/assets/logo/", key="card", limit=20, window=60),
+        RateLimit(method="POST", path="/v1/socials/", key="card", limit=30, window=60),
+        RateLimit(method="POST", path="/v1/cards/bulk/", key="admin", limit=10, window=60),
+        RateLimit(method="POST", path="/v1/cards/bulk/actions/", key="admin", limit=10, window=60),
+    ]
+
     S3_ACCESS_KEY: str
     S3_SECRET_KEY: str
     S3_DOMAIN: str
     BUCKET_NAME: str
+    S3_MAX_POOL_CONNECTIONS: int = 50
+    S3_KEEPALIVE_TIMEOUT: int = 60
+    S3_MAX_CONCURRENCY: int = 16
+    # S3 requires every multipart part except the last to be at least 5 MiB
+    S3_MULTIPART_PART_SIZE: int = 5 * 1024 * 1024
+    # S3 uploads in flight per worker, streamed and single PutObject alike;
+    # a streamed upload buffers at most one part
+    S3_MAX_CONCURRENT_UPLOADS: int = 8
+
+    OUTBOX_POLL_INTERVAL: float = 2.0
+    OUTBOX_BATCH_SIZE: int = 500
+    OUTBOX_RETRY_DELAY: int = 5
+    OUTBOX_MAX_RETRY_DELAY: int = 3600
 
     ALLOWED_IMAGE_TYPES: list[str]
     IMAGE_MAX_SIZE: int
     IMAGE_EXPIRE_TIME: int
+    IMAGE_RENDITION_SIZES: list[int] = [64, 256, 512]
+    IMAGE_WORKERS: int = 2
+    IMAGE_URL_CACHE_MARGIN: int = 900
+    IMAGE_URL_REFRESH_AHEAD: int = 300
+    IMAGE_URL_LOCK_TIMEOUT: int = 5
+    # rendered cards embed presigned URLs and card ETags roll over every
+    # CARD_CACHE_TTL seconds, keep it below half of IMAGE_URL_CACHE_MARGIN
+    CARD_CACHE_TTL: int = 300
 
     JWT_SECRET: str
     JWT_ALGORITHM: str
     JWT_EXPIRE_MINUTES: int
+    TOKEN_CACHE_SIZE: int = 10000
 
     LOG_DIR: str
+    LOG_LEVEL: str = "INFO"
+    # per module overrides, keyed by module path without the app. prefix
+    LOG_LEVELS: dict[str, str] = {}
+    REQUEST_ID_HEADER: str = "X-Request-ID"
+
+    # admin-only sampling profiler, see app/middleware/profiler.py
+    PROFILER_ENABLED: bool = False
+    PROFILE_HEADER: str = "X-Profile"
+    PROFILE_INTERVAL: float = 0.005
+    PROFILE_DIR: str = "profiles"
+    PROFILE_MAX_WINDOW: int = 1000
 
     S3_AVATAR_TEMPLATE: str
     S3_ICON_TEMPLATE: str
@@ -31,11 +114,27 @@ class Config(BaseSettings):
     CODE_LEN: int
 
     ADMIN_SECRET: str
+    ADMIN_PAGE_SIZE: int = 50
+    ADMIN_MAX_PAGE_SIZE: int = 500
+    BULK_MAX_CARDS: int = 10000
     
     @property
     def DATABASE_URL(self) -> str:
         return f"postgresql+psycopg://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
+    @property
+    def REPLICA_DATABASE_URL(self) -> str | None:
+        if not self.DB_REPLICA_HOST:
+            return None
+        port: int = self.DB_REPLICA_PORT or self.DB_PORT
+        return f"postgresql+psycopg://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_REPLICA_HOST}:{port}/{self.DB_NAME}"
+
+    @property
+    def IMAGE_URL_CACHE_TTL(self) -> int:
+        # cached URLs must outlive their Redis entry by at least the margin,
+        # so a client never receives a link that is about to expire
+        return max(self.IMAGE_EXPIRE_TIME - self.IMAGE_URL_CACHE_MARGIN, 1)
+
     @property
     def REDIS_URL(self) -> str:
         return f"redis://{self.REDIS_HOST}:{self.REDIS_PORT}"
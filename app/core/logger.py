@@ -1,14 +1,62 @@
+import atexit
+import json
 import os
 import sys
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 from app.core.config import config
 
 LOG_DIR: str = config.LOG_DIR
 os.makedirs(LOG_DIR, exist_ok=True)
 
-formatter = logging.Formatter("%(asctime)s | %(levelname)s | %(name)s | %(message)s")
+# set per request by app.middleware.request_id
+request_id: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+# LogRecord attributes that are not user supplied extra= fields
+RECORD_ATTRS: frozenset[str] = frozenset(
+    logging.makeLogRecord({}).__dict__) | {"message", "asctime", "request_id"}
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        entry.update({key: value for key, value in record.__dict__.items() if key not in RECORD_ATTRS})
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class RequestIdFilter(logging.Filter):
+    # runs before the record is queued, while the request context is current
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id.get()
+        return True
+
+
+class LogQueueHandler(QueueHandler):
+    # merges args and renders the traceback before the record crosses
+    # threads, but leaves the final layout to the listener's formatters
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+
+formatter = JSONFormatter()
 
 console_handler: logging.Handler = logging.StreamHandler(sys.stdout)
 console_handler.setFormatter(formatter)
@@ -29,8 +77,29 @@ error_handler: RotatingFileHandler = RotatingFileHandler(
 error_handler.setLevel(logging.ERROR)
 error_handler.setFormatter(formatter)
 
+# the event loop only enqueues; writes and rotation happen in the listener thread
+log_queue: queue.SimpleQueue = queue.SimpleQueue()
+queue_handler: LogQueueHandler = LogQueueHandler(log_queue)
+queue_handler.addFilter(RequestIdFilter())
+
+listener: QueueListener = QueueListener(
+    log_queue, console_handler, file_handler, error_handler, respect_handler_level=True
+)
+listener.start()
+# flushes what is still queued on interpreter exit
+atexit.register(listener.stop)
+
 logger: logging.Logger = logging.getLogger("taply")
-logger.setLevel(logging.INFO)
-logger.addHandler(console_handler)
-logger.addHandler(file_handler)
-logger.addHandler(error_handler)
+logger.setLevel(config.LOG_LEVEL)
+logger.addHandler(queue_handler)
+
+for name, level in config.LOG_LEVELS.items():
+    logging.getLogger(f"taply.{name}").setLevel(level)
+
+
+# app.s3.client logs as taply.s3.client, so LOG_LEVELS={"s3": "WARNING"}
+# quiets the whole package
+def get_logger(module: str) -> logging.Logger:
+    if module.startswith("app."):
+        module = module[len("app."):]
+    return logger.getChild(module)
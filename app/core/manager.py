@@ -1,36 +1,158 @@
+import asyncio
+import time
 from typing import AsyncGenerator
-    
+
+from app.core import metrics
 from app.core.config import config
-from app.core.models.base import Base
+from app.core.logger import get_logger
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError, SQLAlchemyError, TimeoutError as PoolTimeoutError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+logger = get_logger(__name__)
+
+
+# replay lag in seconds; 0 when fully replayed (an idle primary would
+# otherwise look lagging) or when the server is not a standby at all
+REPLICA_LAG_QUERY = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    # times every checkout, including the wait for a free connection
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts: int = 0
+        self.timeouts: int = 0
+        self.wait_total: float = 0.0
+        self.wait_max: float = 0.0
+
+    def connect(self):
+        started: float = time.perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited: float = time.perf_counter() - started
+            self.checkouts += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+    def stats(self) -> dict[str, int | float]:
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": self.overflow(),
+            "max_overflow": self._max_overflow,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_total_seconds": self.wait_total,
+            "wait_max_seconds": self.wait_max,
+        }
+
+
+def create_engine(url: str):
+    connect_args: dict = {}
+    if config.DB_PGBOUNCER:
+        # prepared statements are per server connection, which PgBouncer
+        # swaps between transactions
+        connect_args["prepare_threshold"] = None
+    return create_async_engine(
+        url,
+        query_cache_size=1200,
+        poolclass=InstrumentedPool,
+        pool_size=config.DB_POOL_SIZE,
+        max_overflow=config.DB_MAX_OVERFLOW,
+        pool_timeout=config.DB_POOL_TIMEOUT,
+        pool_recycle=config.DB_POOL_RECYCLE,
+        pool_pre_ping=config.DB_POOL_PRE_PING,
+        connect_args=connect_args,
+        echo=False,
+    )
 
 
 class AsyncDatabaseManager:
     def __init__(self):
-        self.async_engine = create_async_engine(
-            config.DATABASE_URL,
-            query_cache_size=1200,
-            pool_size=20,
-            max_overflow=200,
-            future=True,
-            echo=False,
-        )
+        self.async_engine = create_engine(config.DATABASE_URL)
         self.async_session_maker = async_sessionmaker(
             bind=self.async_engine,
             expire_on_commit=False,
         )
+        metrics.instrument_engine(self.async_engine, "primary")
+
+        self.replica_engine = None
+        self.replica_session_maker = None
+        # reads go to the primary until the first lag check passes
+        self.replica_available: bool = False
+        if config.REPLICA_DATABASE_URL:
+            self.replica_engine = create_engine(config.REPLICA_DATABASE_URL)
+            self.replica_session_maker = async_sessionmaker(
+                bind=self.replica_engine,
+                expire_on_commit=False,
+            )
+            metrics.instrument_engine(self.replica_engine, "replica")
+
+    async def _replica_lag(self) -> float:
+        async with self.replica_engine.connect() as conn:
+            return float((await conn.execute(REPLICA_LAG_QUERY)).scalar() or 0)
+
+    async def check_replica(self) -> None:
+        try:
+            # an unreachable host must not stall the monitor past one interval
+            lag: float = await asyncio.wait_for(self._replica_lag(), timeout=config.DB_REPLICA_CHECK_INTERVAL)
+            available: bool = lag <= config.DB_REPLICA_MAX_LAG
+            reason: str = f"replication lag {lag:.1f}s"
+        except (SQLAlchemyError, OSError, asyncio.TimeoutError) as e:
+            available = False
+            reason = str(e) or type(e).__name__
+        if available != self.replica_available:
+            if available:
+                logger.info("Read replica in use (%s)", reason)
+            else:
+                logger.warning("Read replica disabled, reading from primary: %s", reason)
+        self.replica_available = available
+
+    async def monitor_replica(self, stop: asyncio.Event) -> None:
+        while not stop.is_set():
+            await self.check_replica()
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=config.DB_REPLICA_CHECK_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+
+    # schema is managed by migrations (python -m app.migrate), startup only
+    # reads the applied revision
+    async def get_schema_revision(self) -> str | None:
+        async with self.async_engine.connect() as conn:
+            try:
+                result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+            except ProgrammingError:
+                return None
+            return result.scalar_one_or_none()
 
-    # === Deprecated. Will be removed starting from October 2025 ===
-    async def create_all_tables(self) -> None:
-        async with self.async_engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
+    def pool_status(self) -> dict[str, int | float]:
+        return self.async_engine.pool.stats()
 
     async def dispose(self) -> None:
         await self.async_engine.dispose()
+        if self.replica_engine is not None:
+            await self.replica_engine.dispose()
 
     # this function returns async session used in fastapi dependency injections
-    async def get_async_session(self) -> AsyncGenerator[AsyncSession, None]:
-        async with self.async_session_maker() as session:
+    async def get_async_session(self, replica: bool = False) -> AsyncGenerator[AsyncSession, None]:
+        session_maker = self.async_session_maker
+        if replica and self.replica_available:
+            session_maker = self.replica_session_maker
+        async with session_maker() as session:
             try:
                 yield session
             finally:
@@ -0,0 +1,193 @@
+"""
+Prometheus metrics.
+
+Every worker records into the prometheus_client default registry. With
+several workers, set PROMETHEUS_MULTIPROC_DIR to an empty directory before
+they start; /metrics then aggregates all workers, and the pool and token
+cache figures carry the pid of the worker that answered the scrape.
+"""
+import os
+import time
+from functools import wraps
+from typing import Awaitable, Callable, Iterator, ParamSpec, TypeVar
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, Metric
+from prometheus_client.multiprocess import MultiProcessCollector
+from prometheus_client.registry import Collector
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+# backend calls are mostly sub-millisecond to tens of milliseconds
+BACKEND_BUCKETS: tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0
+)
+
+HTTP_REQUESTS = Counter(
+    "taply_http_requests_total",
+    "HTTP requests by route template and status code",
+    ["method", "route", "status"],
+)
+HTTP_LATENCY = Histogram(
+    "taply_http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route"],
+)
+SQL_LATENCY = Histogram(
+    "taply_sql_duration_seconds",
+    "SQL statement latency by engine and statement type",
+    ["engine", "operation"],
+    buckets=BACKEND_BUCKETS,
+)
+S3_LATENCY = Histogram(
+    "taply_s3_duration_seconds",
+    "S3Client call latency by method and outcome",
+    ["method", "outcome"],
+    buckets=BACKEND_BUCKETS,
+)
+REDIS_LATENCY = Histogram(
+    "taply_redis_duration_seconds",
+    "Redis command latency; pipelines are timed as one PIPELINE call",
+    ["command"],
+    buckets=BACKEND_BUCKETS,
+)
+CACHE_LOOKUPS = Counter(
+    "taply_cache_lookups_total",
+    "Cache lookups by cache and result (hit, miss, error)",
+    ["cache", "result"],
+)
+
+
+def timed(histogram: Histogram, name: str) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, Awaitable[T]]]:
+    # decorates a coroutine function; histogram labels are (name, outcome)
+    def decorator(func: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
+        ok = histogram.labels(name, "ok")
+        error = histogram.labels(name, "error")
+
+        @wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            started: float = time.perf_counter()
+            try:
+                result: T = await func(*args, **kwargs)
+            except BaseException:
+                error.observe(time.perf_counter() - started)
+                raise
+            ok.observe(time.perf_counter() - started)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def instrument_engine(engine: AsyncEngine, name: str) -> None:
+    # start times are stacked on the connection, statements on one
+    # connection never overlap
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        started: float = conn.info["query_started"].pop()
+        SQL_LATENCY.labels(name, statement_type(statement)).observe(time.perf_counter() - started)
+
+    @event.listens_for(engine.sync_engine, "handle_error")
+    def handle_error(exception_context) -> None:
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_started"):
+            conn.info["query_started"].pop()
+
+
+def statement_type(statement: str) -> str:
+    # first keyword only: labels must not carry statement text
+    keyword: str = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    if keyword in {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"}:
+        return keyword
+    return "OTHER"
+
+
+def record_cache(cache: str, hits: int = 0, misses: int = 0, errors: int = 0) -> None:
+    if hits:
+        CACHE_LOOKUPS.labels(cache, "hit").inc(hits)
+    if misses:
+        CACHE_LOOKUPS.labels(cache, "miss").inc(misses)
+    if errors:
+        CACHE_LOOKUPS.labels(cache, "error").inc(errors)
+
+
+class StatsCollector(Collector):
+    # figures kept by the objects themselves, read at scrape time
+    def __init__(
+        self,
+        pool_stats: Callable[[], dict[str, int | float]],
+        token_cache_stats: Callable[[], dict[str, int]],
+        replica_available: Callable[[], bool | None]
+    ):
+        self.pool_stats = pool_stats
+        self.token_cache_stats = token_cache_stats
+        self.replica_available = replica_available
+
+    def collect(self) -> Iterator[Metric]:
+        # per worker figures; tell the workers apart when they are aggregated
+        multiprocess: bool = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+        labels: list[str] = ["pid"] if multiprocess else []
+        values: list[str] = [str(os.getpid())] if multiprocess else []
+
+        def gauge(name: str, documentation: str, value: float) -> GaugeMetricFamily:
+            metric = GaugeMetricFamily(name, documentation, labels=labels)
+            metric.add_metric(values, value)
+            return metric
+
+        def counter(name: str, documentation: str, value: float) -> CounterMetricFamily:
+            metric = CounterMetricFamily(name, documentation, labels=labels)
+            metric.add_metric(values, value)
+            return metric
+
+        pool: dict[str, int | float] = self.pool_stats()
+        yield gauge("taply_db_pool_size", "Persistent connections the pool keeps", pool["size"])
+        yield gauge("taply_db_pool_checked_out", "Connections in use", pool["checked_out"])
+        yield gauge("taply_db_pool_overflow", "Connections opened beyond pool size", pool["overflow"])
+        yield gauge(
+            "taply_db_pool_capacity",
+            "Most connections the pool may hand out",
+            pool["size"] + pool["max_overflow"],
+        )
+        yield counter("taply_db_pool_checkouts", "Connection checkouts", pool["checkouts"])
+        yield counter("taply_db_pool_timeouts", "Checkouts that gave up waiting", pool["timeouts"])
+        yield counter(
+            "taply_db_pool_wait_seconds", "Time spent waiting for a connection", pool["wait_total_seconds"]
+        )
+
+        tokens: dict[str, int] = self.token_cache_stats()
+        yield gauge("taply_token_cache_size", "Verified tokens cached", tokens["size"])
+        yield counter("taply_token_cache_hits", "Token verifications served from cache", tokens["hits"])
+        yield counter("taply_token_cache_misses", "Token verifications that decoded the JWT", tokens["misses"])
+        yield counter("taply_token_cache_evictions", "Tokens evicted from the cache", tokens["evictions"])
+
+        replica: bool | None = self.replica_available()
+        if replica is not None:
+            yield gauge("taply_db_replica_available", "1 while reads may use the replica", int(replica))
+
+
+def render(collector: StatsCollector) -> tuple[bytes, str]:
+    # returns the exposition body and its content type
+    multiprocess_dir: str | None = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if multiprocess_dir:
+        registry = CollectorRegistry()
+        MultiProcessCollector(registry, path=multiprocess_dir)
+    else:
+        registry = REGISTRY
+    local = CollectorRegistry()
+    local.register(collector)
+    return generate_latest(registry) + generate_latest(local), CONTENT_TYPE_LATEST
@@ -3,3 +3,4 @@ from .card import Card
 from .code import Code
 from .social import CardSocial
 
+from .outbox import S3Outbox
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import String, Integer, ForeignKey, DateTime
+from sqlalchemy import String, Integer, ForeignKey, DateTime, Index, JSON, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy import Enum as SQLEnum
 
@@ -8,11 +8,21 @@ from app.core import enums
 
 class CardAsset(Base):
     __tablename__ = "card_assets"
+    __table_args__ = (
+        # (card_id, type) lookups; the leading card_id also serves the FK cascade
+        Index("ix_card_assets_card_id_type", "card_id", "type"),
+        Index(
+            "uq_card_assets_avatar_card_id", "card_id",
+            unique=True,
+            postgresql_where=text("type = 'avatar'")
+        ),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, nullable=False)
-    card_id: Mapped[int] = mapped_column(ForeignKey("cards.id", ondelete="CASCADE"), nullable=False, index=True)
+    card_id: Mapped[int] = mapped_column(ForeignKey("cards.id", ondelete="CASCADE"), nullable=False)
     type: Mapped[enums.AssetType] = mapped_column(SQLEnum(enums.AssetType, name="asset_type"), nullable=False)
     file_name: Mapped[str] = mapped_column(String, nullable=False, unique=True)
+    renditions: Mapped[dict[str, str] | None] = mapped_column(JSON, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
 
     card = relationship("Card", back_populates="assets")
\ No newline at end of file
@@ -1,15 +1,23 @@
 from datetime import datetime
-from sqlalchemy import String, Boolean, ForeignKey, BigInteger, DateTime
+from sqlalchemy import String, Boolean, ForeignKey, BigInteger, DateTime, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.models.base import Base
 
 class Code(Base):
     __tablename__ = "codes"
+    __table_args__ = (
+        # redemption looks up active codes only; deactivated hashes are not indexed
+        Index(
+            "uq_codes_active_code_hash", "code_hash",
+            unique=True,
+            postgresql_where=text("is_active")
+        ),
+    )
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True, nullable=False)
     card_id: Mapped[int] = mapped_column(ForeignKey("cards.id", ondelete="CASCADE"), nullable=False, index=True)
-    code_hash: Mapped[str] = mapped_column(String, nullable=False, index=True, unique=True)
+    code_hash: Mapped[str] = mapped_column(String, nullable=False)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
 
@@ -0,0 +1,16 @@
+from datetime import datetime
+from sqlalchemy import String, Integer, BigInteger, DateTime
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.core.models.base import Base
+
+class S3Outbox(Base):
+    """S3 object deletion written in the same transaction as the DB change."""
+    __tablename__ = "s3_outbox"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, nullable=False)
+    object_name: Mapped[str] = mapped_column(String, nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    available_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    last_error: Mapped[str] = mapped_column(String, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import String, Integer, ForeignKey, Enum as SQLEnum, Boolean
+from sqlalchemy import String, Integer, ForeignKey, Enum as SQLEnum, Boolean, Index
 from sqlalchemy import DateTime
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -8,9 +8,13 @@ from app.core import enums
 
 class CardSocial(Base):
     __tablename__ = "card_socials"
+    __table_args__ = (
+        # socials are always read per card in order_id order
+        Index("ix_card_socials_card_id_order_id", "card_id", "order_id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, nullable=False)
-    card_id: Mapped[int] = mapped_column(ForeignKey("cards.id", ondelete="CASCADE"), nullable=False, index=True)
+    card_id: Mapped[int] = mapped_column(ForeignKey("cards.id", ondelete="CASCADE"), nullable=False)
     type: Mapped[enums.SocialType] = mapped_column(SQLEnum(enums.SocialType, name="social_type"), nullable=False)
     url: Mapped[str] = mapped_column(String, nullable=False)
     label: Mapped[str] = mapped_column(String, nullable=True)
@@ -1,21 +1,141 @@
-from redis.asyncio import Redis, from_url
+import secrets
+import time
 
+from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
+from redis.asyncio.lock import Lock
+
+from app.core import metrics
 from app.core.config import config
 
+# store a rendered card only if no write bumped its version in the meantime
+CACHE_CARD_SCRIPT: str = """
+local version = redis.call('GET', KEYS[2]) or ''
+if version == ARGV[2] then
+    redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[3])
+    return 1
+end
+return 0
+"""
+
+# sliding window log: one sorted set member per request within the window;
+# returns {allowed, milliseconds until the oldest request leaves the window}
+SLIDING_WINDOW_SCRIPT: str = """
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local window = tonumber(ARGV[1])
+local limit = tonumber(ARGV[2])
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, now - window)
+if redis.call('ZCARD', KEYS[1]) < limit then
+    redis.call('ZADD', KEYS[1], now, ARGV[3])
+    redis.call('PEXPIRE', KEYS[1], window)
+    return {1, 0}
+end
+local oldest = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+return {0, tonumber(oldest[2]) + window - now}
+"""
+
+
+class InstrumentedPipeline(Pipeline):
+    # commands are only buffered until execute(), time the round trip
+    async def execute(self, raise_on_error: bool = True):
+        started: float = time.perf_counter()
+        try:
+            return await super().execute(raise_on_error)
+        finally:
+            metrics.REDIS_LATENCY.labels("PIPELINE").observe(time.perf_counter() - started)
+
+
+class InstrumentedRedis(Redis):
+    # scripts and locks go through execute_command too, as EVALSHA
+    async def execute_command(self, *args, **options):
+        started: float = time.perf_counter()
+        try:
+            return await super().execute_command(*args, **options)
+        finally:
+            metrics.REDIS_LATENCY.labels(str(args[0]).upper()).observe(time.perf_counter() - started)
+
+    def pipeline(self, transaction: bool = True, shard_hint: str | None = None) -> InstrumentedPipeline:
+        return InstrumentedPipeline(self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
 
 class RedisManager:
     def __init__(self):
-        self.redis: Redis = from_url(
+        self.redis: Redis = InstrumentedRedis.from_url(
             config.REDIS_URL,
             encoding="utf-8",
             decode_responses=True,
         )
-    
-    async def cashe_avatar(self, card_id: int, url: str) -> None:
-        await self.redis.set(f"avatar:{card_id}", url, ex=config.IMAGE_EXPIRE_TIME)
+        self._cache_card = self.redis.register_script(CACHE_CARD_SCRIPT)
+        self._sliding_window = self.redis.register_script(SLIDING_WINDOW_SCRIPT)
+
+    async def cache_object_url(self, object_name: str, url: str) -> None:
+        await self.redis.set(f"s3url:{object_name}", url, ex=config.IMAGE_URL_CACHE_TTL)
+
+    async def get_cached_object_url(self, object_name: str) -> tuple[str | None, int]:
+        # returns the cached URL together with its remaining TTL in seconds
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.get(f"s3url:{object_name}")
+            pipe.ttl(f"s3url:{object_name}")
+            url, ttl = await pipe.execute()
+        return url, ttl
+
+    async def get_cached_object_urls(self, object_names: list[str]) -> dict[str, tuple[str | None, int]]:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for object_name in object_names:
+                pipe.get(f"s3url:{object_name}")
+                pipe.ttl(f"s3url:{object_name}")
+            results: list = await pipe.execute()
+        return {
+            object_name: (results[2 * i], results[2 * i + 1])
+            for i, object_name in enumerate(object_names)
+        }
+
+    async def delete_cached_object_urls(self, object_names: list[str]) -> None:
+        await self.redis.delete(*(f"s3url:{object_name}" for object_name in object_names))
+
+    async def get_cached_card(self, card_id: int) -> tuple[str | None, str]:
+        # returns the rendered card and the version it has to be stored under
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.get(f"card:{card_id}")
+            pipe.get(f"card:{card_id}:version")
+            payload, version = await pipe.execute()
+        return payload, version or ""
+
+    async def cache_card(self, card_id: int, payload: str, version: str) -> bool:
+        stored: int = await self._cache_card(
+            keys=[f"card:{card_id}", f"card:{card_id}:version"],
+            args=[payload, version, config.CARD_CACHE_TTL],
+        )
+        return bool(stored)
+
+    async def invalidate_card(self, card_id: int) -> None:
+        await self.invalidate_cards([card_id])
+
+    async def invalidate_cards(self, card_ids: list[int]) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            for card_id in card_ids:
+                pipe.incr(f"card:{card_id}:version")
+                pipe.expire(f"card:{card_id}:version", 86400)
+                pipe.delete(f"card:{card_id}")
+                if config.DB_REPLICA_HOST:
+                    # read-your-writes: keep the card on the primary while the replica catches up
+                    pipe.set(f"card:{card_id}:pin", 1, ex=config.DB_REPLICA_PIN_SECONDS)
+            await pipe.execute()
+
+    async def is_card_pinned(self, card_id: int) -> bool:
+        return bool(await self.redis.exists(f"card:{card_id}:pin"))
+
+    async def hit_rate_limit(self, key: str, limit: int, window: int) -> tuple[bool, int]:
+        # returns whether the request is allowed and, if not, the wait in milliseconds
+        allowed, retry_after = await self._sliding_window(
+            keys=[f"ratelimit:{key}"],
+            args=[window * 1000, limit, secrets.token_hex(8)]
+        )
+        return bool(allowed), int(retry_after)
 
-    async def get_cashed_avatar(self, card_id: int) -> str | None:
-        return await self.redis.get(f"avatar:{card_id}")
+    def lock(self, name: str, timeout: int) -> Lock:
+        return self.redis.lock(f"lock:{name}", timeout=timeout)
 
     async def close(self) -> None:
         await self.redis.close()
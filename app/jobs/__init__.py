@@ -0,0 +1,5 @@
+"""
+One-shot maintenance jobs.
+
+Run as modules, e.g. `python -m app.jobs.reconcile_assets --dry-run`.
+"""
@@ -0,0 +1,164 @@
+"""
+Orphan asset reconciler.
+
+Diffs the bucket against the keys referenced by card_assets (originals and
+renditions) and the S3 outbox. Both sides are paged in the same sort
+order and merged, so memory stays bounded regardless of bucket size. Every
+page of referenced keys is read in its own short transaction, none stays
+open while the bucket is listed.
+
+Usage:
+    python -m app.jobs.reconcile_assets --dry-run
+    python -m app.jobs.reconcile_assets --min-age 86400
+"""
+import argparse
+import asyncio
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator
+
+from app import repo
+from app.core.config import config
+from app.core.logger import get_logger
+from app.core.manager import AsyncDatabaseManager
+from app.s3.client import S3Client
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class Report:
+    dry_run: bool
+    scanned: int = 0
+    referenced: int = 0
+    orphans: int = 0
+    orphan_bytes: int = 0
+    deleted: int = 0
+    failed: int = 0
+    skipped_recent: int = 0
+    skipped_unmanaged: int = 0
+    missing: int = 0
+    elapsed: float = 0.0
+    samples: list[str] = field(default_factory=list)
+
+
+def managed_prefixes() -> tuple[str, ...]:
+    # only keys produced by our templates are candidates for deletion
+    return tuple(
+        template.split("{", 1)[0]
+        for template in (config.S3_AVATAR_TEMPLATE, config.S3_ICON_TEMPLATE)
+    )
+
+
+async def referenced_names(db_manager: AsyncDatabaseManager, batch_size: int) -> AsyncIterator[str]:
+    # keyset pages, each in its own session so no connection or snapshot
+    # is held for the whole scan
+    after: str = ""
+    while True:
+        async with db_manager.async_session_maker() as session:
+            names: list[str] = await repo.assets.get_object_names(
+                after=after, limit=batch_size, session=session
+            )
+        for name in names:
+            yield name
+        if len(names) < batch_size:
+            return
+        after = names[-1]
+
+
+async def reconcile(
+    db_manager: AsyncDatabaseManager,
+    s3_client: S3Client,
+    dry_run: bool,
+    min_age: int,
+    batch_size: int = 1000,
+    progress_every: int = 10000
+) -> Report:
+    report = Report(dry_run=dry_run)
+    started: float = time.monotonic()
+    cutoff: datetime = datetime.now(timezone.utc) - timedelta(seconds=min_age)
+    prefixes: tuple[str, ...] = managed_prefixes()
+    pending: list[str] = []
+
+    async def flush() -> None:
+        if not dry_run and pending:
+            errors: dict[str, str] = await s3_client.delete_assets(list(pending))
+            report.deleted += len(pending) - len(errors)
+            report.failed += len(errors)
+        pending.clear()
+
+    referenced = referenced_names(db_manager, batch_size)
+    current: str | None = await anext(referenced, None)
+
+    async for obj in s3_client.iter_objects(page_size=batch_size):
+        key: str = obj["Key"]
+        report.scanned += 1
+        if report.scanned % progress_every == 0:
+            logger.info("Reconciler progress: %s", json.dumps(asdict(report) | {'samples': None}))
+
+        while current is not None and current < key:
+            report.missing += 1
+            current = await anext(referenced, None)
+        if current == key:
+            report.referenced += 1
+            current = await anext(referenced, None)
+            continue
+
+        if not key.startswith(prefixes):
+            report.skipped_unmanaged += 1
+            continue
+        if obj["LastModified"] > cutoff:
+            # may belong to an upload whose row is not committed yet
+            report.skipped_recent += 1
+            continue
+
+        report.orphans += 1
+        report.orphan_bytes += obj.get("Size", 0)
+        if len(report.samples) < 20:
+            report.samples.append(key)
+        pending.append(key)
+        if len(pending) >= batch_size:
+            await flush()
+
+    while current is not None:
+        report.missing += 1
+        current = await anext(referenced, None)
+
+    await flush()
+    report.elapsed = round(time.monotonic() - started, 2)
+    return report
+
+
+async def main(dry_run: bool, min_age: int, batch_size: int) -> Report:
+    db_manager = AsyncDatabaseManager()
+    s3_client = S3Client(
+        aws_access_key_id=config.S3_ACCESS_KEY,
+        aws_secret_access_key=config.S3_SECRET_KEY,
+        endpoint_url=config.S3_DOMAIN,
+        bucket_name=config.BUCKET_NAME,
+    )
+    await s3_client.connect()
+    try:
+        return await reconcile(
+            db_manager=db_manager,
+            s3_client=s3_client,
+            dry_run=dry_run,
+            min_age=min_age,
+            batch_size=batch_size
+        )
+    finally:
+        await s3_client.close()
+        await db_manager.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Delete or report S3 objects not referenced by card_assets.")
+    parser.add_argument("--dry-run", action="store_true", help="only report orphans")
+    parser.add_argument("--min-age", type=int, default=3600, help="ignore objects newer than this many seconds")
+    parser.add_argument("--batch-size", type=int, default=1000, help="list page, query page and delete batch size")
+    args = parser.parse_args()
+
+    result: Report = asyncio.run(main(dry_run=args.dry_run, min_age=args.min_age, batch_size=args.batch_size))
+    print(json.dumps(asdict(result), indent=2))
@@ -1,9 +1,11 @@
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
 
-from app.app_state import db, s3, redis
+from app.app_state import db, images, outbox, s3, redis
 from app.core.config import config
-from app.core.logger import logger
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
 
 
 @asynccontextmanager
@@ -12,10 +14,14 @@ async def lifespan(app: FastAPI):
     logger.info("App starting...")
     await db.set_up(app)
     await redis.set_up(app)
-    s3.set_up(app)
+    await s3.set_up(app)
+    await images.set_up(app)
+    await outbox.set_up(app)
     yield
     # shutdown
     logger.info("App shutting down...")
+    await outbox.clean_up(app)
+    await images.clean_up(app)
+    await s3.clean_up(app)
     await db.clean_up(app)
-    await redis.clean_up(app)
-    s3.clean_up(app)
\ No newline at end of file
+    await redis.clean_up(app)
\ No newline at end of file
@@ -2,12 +2,25 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.lifespan import lifespan
 from app.api.v1 import router as v1_router
+from app.api.metrics import router as metrics_router
+from app.core.config import config
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.profiler import ProfilerMiddleware
+from app.middleware.rate_limit import RateLimitMiddleware
+from app.middleware.request_id import RequestIdMiddleware
 
 
 def create_app() -> FastAPI:
     app = FastAPI(root_path="/api", lifespan=lifespan)
     
     app.include_router(v1_router)
+    app.include_router(metrics_router)
+
+    if config.PROFILER_ENABLED:
+        # innermost, so rate limited requests are never profiled
+        app.add_middleware(ProfilerMiddleware)
+
+    app.add_middleware(RateLimitMiddleware)
 
     app.add_middleware(
         CORSMiddleware,
@@ -15,7 +28,13 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[config.REQUEST_ID_HEADER],
     )
+
+    app.add_middleware(RequestIdMiddleware)
+
+    # added last so it wraps everything, 429s and CORS preflights included
+    app.add_middleware(MetricsMiddleware)
     return app
 
 app: FastAPI = create_app()
@@ -0,0 +1,3 @@
+from . import metrics, profiler, rate_limit, request_id
+
+__all__ = ["metrics", "profiler", "rate_limit", "request_id"]
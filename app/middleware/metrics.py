@@ -0,0 +1,43 @@
+"""
+HTTP metrics middleware.
+
+Outermost middleware, so rate limited requests are counted too. Requests
+are labelled by route template, never by raw path, to keep label
+cardinality bounded; requests that match no route share one label.
+"""
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core import metrics
+
+UNMATCHED_ROUTE: str = "unmatched"
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app: ASGIApp = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started: float = time.perf_counter()
+        status_code: int = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # the router stores the matched route in the shared scope
+            route = scope.get("route")
+            template: str = getattr(route, "path", UNMATCHED_ROUTE)
+            method: str = scope["method"]
+            metrics.HTTP_LATENCY.labels(method, template).observe(time.perf_counter() - started)
+            metrics.HTTP_REQUESTS.labels(method, template, str(status_code)).inc()
@@ -0,0 +1,66 @@
+"""
+Profiling middleware.
+
+Profiles a request when it carries PROFILE_HEADER together with a valid
+admin key, or when it falls into a window armed through the admin API.
+The header is ignored without a valid admin key. Everything else passes
+through after one header scan, and with PROFILER_ENABLED off (the
+default) the middleware is not installed at all.
+"""
+import asyncio
+import sys
+
+from fastapi import HTTPException
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app import utils
+from app.api.v1.dependencies import verify_admin
+from app.core.config import config
+
+
+class ProfilerMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app: ASGIApp = app
+        self.header: bytes = config.PROFILE_HEADER.lower().encode()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path: str = scope["path"]
+        root_path: str = scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path):]
+
+        profile: utils.profiler.Profile | None = None
+        if any(name == self.header for name, _ in scope["headers"]):
+            # without a valid admin key the header is ignored, so it never
+            # changes the response a client gets
+            try:
+                await verify_admin(Headers(scope=scope).get("X-Admin-Key"))
+                profile = utils.profiler.Profile()
+            except HTTPException:
+                pass
+        if profile is None and utils.profiler.window is not None:
+            profile = utils.profiler.claim(path)
+
+        if profile is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (b"x-profile-id", profile.id.encode())]
+            await send(message)
+
+        # samples are cut at this frame, so they only hold the request's own calls
+        target = utils.profiler.sampler.start(sys._getframe())
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            samples = utils.profiler.sampler.stop(target)
+            route = scope.get("route")
+            profile.add(f"{scope['method']} {getattr(route, 'path', path)}", samples)
+            await asyncio.to_thread(profile.save)
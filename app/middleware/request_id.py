@@ -0,0 +1,42 @@
+"""
+Request id middleware.
+
+Takes the id from REQUEST_ID_HEADER when the proxy sends a usable one,
+otherwise generates it, stores it in the logging context so every log
+line of the request carries it, and echoes it in the response.
+"""
+import re
+import uuid
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import config
+from app.core.logger import request_id
+
+VALID_REQUEST_ID: re.Pattern = re.compile(r"^[A-Za-z0-9._-]{1,128}$")
+
+
+class RequestIdMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app: ASGIApp = app
+        self.header: bytes = config.REQUEST_ID_HEADER.lower().encode()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming: str | None = Headers(scope=scope).get(config.REQUEST_ID_HEADER)
+        value: str = incoming if incoming and VALID_REQUEST_ID.match(incoming) else uuid.uuid4().hex
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (self.header, value.encode())]
+            await send(message)
+
+        token = request_id.set(value)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id.reset(token)
@@ -0,0 +1,74 @@
+"""
+One-shot schema migration.
+
+Run once per deploy, before the API workers start:
+
+    python -m app.migrate            # upgrade to the latest revision
+    python -m app.migrate --sql      # print the SQL instead of running it
+
+Databases created by the old create_all startup path are stamped at the
+initial revision first, then upgraded like any other.
+"""
+import argparse
+import asyncio
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config as AlembicConfig
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import config
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+ALEMBIC_INI: Path = Path(__file__).resolve().parent.parent / "alembic.ini"
+BASELINE_REVISION: str = "0001"
+
+
+def alembic_config() -> AlembicConfig:
+    alembic_cfg = AlembicConfig(str(ALEMBIC_INI))
+    # keep the application's logging setup
+    alembic_cfg.attributes["configure_logger"] = False
+    return alembic_cfg
+
+
+def head_revision() -> str | None:
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+
+async def is_unversioned_legacy_schema() -> bool:
+    engine = create_async_engine(config.DATABASE_URL, poolclass=NullPool)
+    try:
+        async with engine.connect() as connection:
+            tables: set[str] = await connection.run_sync(
+                lambda sync_connection: set(inspect(sync_connection).get_table_names())
+            )
+    finally:
+        await engine.dispose()
+    return "cards" in tables and "alembic_version" not in tables
+
+
+def main(sql: bool = False) -> None:
+    alembic_cfg = alembic_config()
+    if sql:
+        command.upgrade(alembic_cfg, "head", sql=True)
+        return
+
+    if asyncio.run(is_unversioned_legacy_schema()):
+        logger.info("Unversioned schema found, stamping revision %s", BASELINE_REVISION)
+        command.stamp(alembic_cfg, BASELINE_REVISION)
+
+    logger.info("Upgrading database schema to %s", head_revision())
+    command.upgrade(alembic_cfg, "head")
+    logger.info("Database schema is up to date")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply database migrations.")
+    parser.add_argument("--sql", action="store_true", help="print SQL instead of running it")
+    args = parser.parse_args()
+    main(sql=args.sql)
@@ -1,3 +1,3 @@
-from . import cards, codes, avatars, logos, socials
+from . import assets, cards, codes, avatars, logos, outbox, socials
 
-__all__ = ["cards", "codes", "avatars", "logos", "socials"]
+__all__ = ["assets", "cards", "codes", "avatars", "logos", "outbox", "socials"]
@@ -0,0 +1,41 @@
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import models
+
+# every S3 key the database still references: originals, renditions and
+# keys already queued for deletion; "C" collation matches S3 listing order.
+# A UNION only orders by output columns, so the collated order goes outside
+OBJECT_NAMES_QUERY = text("""
+    SELECT object_name FROM (
+        SELECT file_name AS object_name FROM card_assets
+        UNION
+        SELECT rendition.value FROM card_assets, json_each_text(card_assets.renditions) AS rendition
+        WHERE card_assets.renditions IS NOT NULL
+        UNION
+        SELECT object_name FROM s3_outbox
+    ) AS names
+    WHERE object_name COLLATE "C" > :after
+    ORDER BY object_name COLLATE "C"
+    LIMIT :limit
+""")
+
+async def get_by_cards(
+    *,
+    card_ids: list[int],
+    session: AsyncSession
+) -> list[models.CardAsset]:
+    result = await session.execute(
+        select(models.CardAsset).where(models.CardAsset.card_id.in_(card_ids))
+    )
+    return list(result.scalars().all())
+
+async def get_object_names(
+    *,
+    after: str,
+    limit: int,
+    session: AsyncSession
+) -> list[str]:
+    # keyset page of referenced keys, "" starts from the first one
+    result = await session.execute(OBJECT_NAMES_QUERY, {"after": after, "limit": limit})
+    return list(result.scalars().all())
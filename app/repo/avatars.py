@@ -1,8 +1,13 @@
 from app.core import models, enums
 
-from sqlalchemy import select, delete
+from datetime import datetime
+
+from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.repo import cards
+
 async def get(
     *,
     card_id: int,
@@ -21,17 +26,27 @@ async def create(
     *, 
     card_id: int,
     file_name: str,
+    renditions: dict[str, str] | None,
     session: AsyncSession
 ) -> models.CardAsset:
-    await session.execute(
-        delete(models.CardAsset)
-        .where(models.CardAsset.card_id == card_id)
-        .where(models.CardAsset.type == enums.AssetType.avatar)
+    # one avatar per card is enforced by uq_card_assets_avatar_card_id
+    query = insert(models.CardAsset).values(
+        card_id=card_id,
+        type=enums.AssetType.avatar,
+        file_name=file_name,
+        renditions=renditions,
+        created_at=datetime.utcnow()
     )
-    await session.commit()
-
-    asset: models.CardAsset = models.CardAsset(card_id=card_id, type=enums.AssetType.avatar, file_name=file_name)
-    session.add(asset)
-    await session.commit()
-    await session.refresh(asset)
+    query = query.on_conflict_do_update(
+        index_elements=[models.CardAsset.card_id],
+        index_where=text("type = 'avatar'"),
+        set_={
+            "file_name": query.excluded.file_name,
+            "renditions": query.excluded.renditions,
+            "created_at": query.excluded.created_at,
+        }
+    ).returning(models.CardAsset)
+    result = await session.execute(query, execution_options={"populate_existing": True})
+    asset: models.CardAsset = result.scalar_one()
+    await cards.touch(card_id=card_id, session=session)
     return asset
\ No newline at end of file
@@ -1,32 +1,170 @@
-from app.core import models
+from datetime import datetime
+
+from app.core import enums, models
+from app import schemas
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import delete as sql_delete, exists, func, insert, select, update as sql_update
+from sqlalchemy.orm import joinedload
 
 async def get(
     *, 
     card_id: int, 
     session: AsyncSession
 ) -> models.Card | None:
+    # columns only, relationships stay unloaded
+    result = await session.execute(
+        select(models.Card).where(models.Card.id == card_id)
+    )
+    return result.scalar_one_or_none()
+
+async def exists_by_id(
+    *,
+    card_id: int,
+    session: AsyncSession
+) -> bool:
+    result = await session.execute(
+        select(exists().where(models.Card.id == card_id))
+    )
+    return bool(result.scalar())
+
+async def get_full(
+    *,
+    card_id: int,
+    session: AsyncSession
+) -> models.Card | None:
+    # socials and assets are joined into the same SELECT; both collections
+    # are a handful of rows per card, so the row fan-out stays small
     query = (
         select(models.Card)
         .where(models.Card.id == card_id)
-        .options(selectinload(models.Card.socials)) 
+        .options(
+            joinedload(models.Card.socials),
+            joinedload(models.Card.assets)
+        )
     )
     result = await session.execute(query)
-    card = result.scalar_one_or_none()
+    card = result.unique().scalar_one_or_none()
     return card
 
+def filter_clauses(filters: schemas.cards.Filter) -> list:
+    clauses: list = []
+    if filters.is_active is not None:
+        clauses.append(models.Card.is_active == filters.is_active)
+    if filters.city is not None:
+        clauses.append(models.Card.city == filters.city)
+    if filters.created_from is not None:
+        clauses.append(models.Card.created_at >= filters.created_from)
+    if filters.created_to is not None:
+        clauses.append(models.Card.created_at < filters.created_to)
+    return clauses
+
+async def get_page(
+    *,
+    after_id: int | None,
+    limit: int,
+    filters: schemas.cards.Filter,
+    with_stats: bool,
+    session: AsyncSession
+) -> list[tuple[models.Card, int | None, bool | None]]:
+    # keyset pagination on the primary key: every page is an index range scan
+    columns: list = [models.Card]
+    if with_stats:
+        columns.append(
+            select(func.count(models.CardSocial.id))
+            .where(models.CardSocial.card_id == models.Card.id)
+            .scalar_subquery()
+        )
+        columns.append(
+            exists()
+            .where(models.CardAsset.card_id == models.Card.id)
+            .where(models.CardAsset.type == enums.AssetType.avatar)
+        )
+    query = (
+        select(*columns)
+        .where(*filter_clauses(filters))
+        .order_by(models.Card.id)
+        .limit(limit)
+    )
+    if after_id is not None:
+        query = query.where(models.Card.id > after_id)
+
+    result = await session.execute(query)
+    if with_stats:
+        return [(card, social_count, has_avatar) for card, social_count, has_avatar in result.all()]
+    return [(card, None, None) for card in result.scalars().all()]
+
+async def get_ids(
+    *,
+    card_ids: list[int] | None = None,
+    filters: schemas.cards.Filter | None = None,
+    limit: int,
+    session: AsyncSession
+) -> list[int]:
+    query = select(models.Card.id).order_by(models.Card.id).limit(limit)
+    if card_ids is not None:
+        query = query.where(models.Card.id.in_(card_ids))
+    if filters is not None:
+        query = query.where(*filter_clauses(filters))
+    result = await session.execute(query)
+    return list(result.scalars().all())
+
+async def set_active(
+    *,
+    card_ids: list[int],
+    is_active: bool,
+    session: AsyncSession
+) -> None:
+    await session.execute(
+        sql_update(models.Card)
+        .where(models.Card.id.in_(card_ids))
+        .values(is_active=is_active, updated_at=datetime.utcnow())
+    )
+
+async def get_updated_at(
+    *,
+    card_id: int,
+    session: AsyncSession
+) -> datetime | None:
+    result = await session.execute(
+        select(models.Card.updated_at).where(models.Card.id == card_id)
+    )
+    return result.scalar_one_or_none()
+
+async def touch(
+    *,
+    card_id: int,
+    session: AsyncSession
+) -> None:
+    # bumps the card version after a change to its socials or assets
+    await session.execute(
+        sql_update(models.Card)
+        .where(models.Card.id == card_id)
+        .values(updated_at=datetime.utcnow())
+    )
+
 async def create(
     *, 
     card: models.Card, 
     session: AsyncSession
 ) -> models.Card:
     session.add(card)
-    await session.commit()
-    await session.refresh(card)
+    # flush for the generated id, defaults are set client-side
+    await session.flush()
     return card
 
+async def create_many(
+    *,
+    cards: list[dict],
+    session: AsyncSession
+) -> list[int]:
+    # executemany with RETURNING is batched into multi-row INSERTs by the
+    # driver; sort_by_parameter_order keeps IDs aligned with the input
+    result = await session.execute(
+        insert(models.Card).returning(models.Card.id, sort_by_parameter_order=True),
+        cards
+    )
+    return list(result.scalars().all())
+
 async def update(
     *,
     card: models.Card,
@@ -35,8 +173,23 @@ async def update(
 ) -> models.Card:
     for key, value in card_update.items():
         setattr(card, key, value)
-    
-    await session.commit()
-    await session.refresh(card)
+    return card
 
-    return card
\ No newline at end of file
+async def delete(
+    *,
+    card_id: int,
+    session: AsyncSession
+) -> None:
+    # socials, assets and codes go with it through ON DELETE CASCADE
+    await session.execute(
+        sql_delete(models.Card).where(models.Card.id == card_id)
+    )
+
+async def delete_many(
+    *,
+    card_ids: list[int],
+    session: AsyncSession
+) -> None:
+    await session.execute(
+        sql_delete(models.Card).where(models.Card.id.in_(card_ids))
+    )
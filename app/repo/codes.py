@@ -1,7 +1,7 @@
 
 from app.core import models
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update
+from sqlalchemy import insert, select, update
 
 async def create(
     *, 
@@ -9,10 +9,27 @@ async def create(
     session: AsyncSession
 ) -> models.Code:
     session.add(code)
-    await session.commit()
-    await session.refresh(code)
     return code
 
+async def create_many(
+    *,
+    codes: list[dict],
+    session: AsyncSession
+) -> None:
+    await session.execute(insert(models.Code), codes)
+
+async def deactivate_many(
+    *,
+    card_ids: list[int],
+    session: AsyncSession
+) -> None:
+    await session.execute(
+        update(models.Code)
+        .where(models.Code.card_id.in_(card_ids))
+        .where(models.Code.is_active == True)
+        .values(is_active=False)
+    )
+
 async def get_active(
     *, 
     code: str, 
@@ -35,5 +52,4 @@ async def deactivate(
         update(models.Code)
         .where(models.Code.card_id == card_id)
         .values(is_active=False)
-    )
-    await session.commit()
\ No newline at end of file
+    )
\ No newline at end of file
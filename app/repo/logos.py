@@ -1,7 +1,9 @@
 from app.core import models, enums
-from sqlalchemy import select, delete, update
+from sqlalchemy import select, delete as sql_delete, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.repo import cards
+
 
 async def get_all(
     *, 
@@ -17,30 +19,39 @@ async def get_all(
     assets = result.scalars().all()
     return {asset.id: asset.file_name for asset in assets}
 
+async def delete(
+    *,
+    asset_id: int,
+    session: AsyncSession
+) -> models.CardAsset | None:
+    result = await session.execute(
+        sql_delete(models.CardAsset)
+        .where(models.CardAsset.id == asset_id)
+        .where(models.CardAsset.type == enums.AssetType.app_icon)
+        .returning(models.CardAsset)
+    )
+    return result.scalar_one_or_none()
+
 async def create(
     *, 
     card_id: int,
     social_id: int,
     file_name: str,
+    renditions: dict[str, str] | None,
     session: AsyncSession
-) -> models.CardAsset | None:
-    result = await session.execute(
-        select(models.CardSocial)
-        .where(models.CardSocial.id == social_id)
-        .where(models.CardSocial.card_id == card_id)
+) -> models.CardAsset:
+    # the social link was checked by validators.socials.require_social
+    asset: models.CardAsset = models.CardAsset(
+        card_id=card_id, type=enums.AssetType.app_icon, file_name=file_name, renditions=renditions
     )
-    social: models.CardSocial | None = result.scalar_one_or_none()
-    if not social:
-        return None
-    asset: models.CardAsset = models.CardAsset(card_id=card_id, type=enums.AssetType.app_icon, file_name=file_name)
     session.add(asset)
-    await session.commit()
-    await session.refresh(asset)
+    # flush for the generated id referenced by the social link
+    await session.flush()
     await session.execute(
         update(models.CardSocial)
         .where(models.CardSocial.id == social_id)
         .where(models.CardSocial.card_id == card_id)
         .values(icon_asset_id=asset.id)
     )
-    await session.commit()
-    return asset
\ No newline at end of file
+    await cards.touch(card_id=card_id, session=session)
+    return asset
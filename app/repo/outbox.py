@@ -0,0 +1,62 @@
+from datetime import datetime
+
+from app.core import models
+from sqlalchemy import Integer, any_, bindparam, case, delete as sql_delete, func, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def add(
+    *,
+    object_names: list[str],
+    session: AsyncSession
+) -> None:
+    session.add_all(models.S3Outbox(object_name=object_name) for object_name in object_names)
+
+async def claim(
+    *,
+    limit: int,
+    session: AsyncSession
+) -> list[models.S3Outbox]:
+    # rows stay locked until the caller commits, other workers skip them
+    result = await session.execute(
+        select(models.S3Outbox)
+        .where(models.S3Outbox.available_at <= datetime.utcnow())
+        .order_by(models.S3Outbox.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    return list(result.scalars().all())
+
+async def remove(
+    *,
+    ids: list[int],
+    session: AsyncSession
+) -> None:
+    await session.execute(
+        sql_delete(models.S3Outbox).where(models.S3Outbox.id.in_(ids))
+    )
+
+async def reschedule(
+    *,
+    errors: dict[int, str],
+    base_delay: int,
+    max_delay: int,
+    session: AsyncSession
+) -> None:
+    # one statement for all rows, last_error is looked up by id;
+    # exponential backoff per row: base_delay * 2^attempts, capped at max_delay
+    ids = bindparam("ids", list(errors), type_=ARRAY(Integer))
+    delay = func.least(base_delay * func.power(2, models.S3Outbox.attempts), max_delay)
+    await session.execute(
+        update(models.S3Outbox)
+        .where(models.S3Outbox.id == any_(ids))
+        .values(
+            attempts=models.S3Outbox.attempts + 1,
+            available_at=func.timezone("utc", func.now()) + func.make_interval(0, 0, 0, 0, 0, 0, delay),
+            last_error=case(
+                {row_id: error[:1000] for row_id, error in errors.items()},
+                value=models.S3Outbox.id
+            ),
+        )
+    )
@@ -1,8 +1,9 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import delete, select
+from sqlalchemy import delete as sql_delete, func, insert, select
 
 from app.core import models
 from app import schemas
+from app.repo import cards
 
 async def is_exist(
     *, 
@@ -32,25 +33,38 @@ async def get(
 
 async def create(
     *, 
-    card: models.Card, 
+    card_id: int, 
     social: schemas.socials.In,
     session: AsyncSession
 ) -> models.CardSocial:
-    card_social: models.CardSocial = models.CardSocial(**social.model_dump())
-    card.socials.append(card_social)
-    await session.commit()
-    await session.refresh(card_social)
+    # appended after the last link without loading the card's socials
+    next_order_id = (
+        select(func.coalesce(func.max(models.CardSocial.order_id) + 1, 0))
+        .where(models.CardSocial.card_id == card_id)
+        .scalar_subquery()
+    )
+    result = await session.execute(
+        insert(models.CardSocial)
+        .values(card_id=card_id, order_id=next_order_id, **social.model_dump())
+        .returning(models.CardSocial)
+    )
+    card_social: models.CardSocial = result.scalar_one()
+    await cards.touch(card_id=card_id, session=session)
     return card_social
 
 async def delete(
     *, 
-    card: models.Card, 
+    card_id: int, 
     social_id: int, 
     session: AsyncSession
 ) -> bool:
-    target_social = next((s for s in card.socials if s.id == social_id), None)
-    if target_social:
-        card.socials.remove(target_social)
-        await session.commit()
-        return True
-    return False
\ No newline at end of file
+    result = await session.execute(
+        sql_delete(models.CardSocial)
+        .where(models.CardSocial.id == social_id)
+        .where(models.CardSocial.card_id == card_id)
+        .returning(models.CardSocial.id)
+    )
+    if result.scalar_one_or_none() is None:
+        return False
+    await cards.touch(card_id=card_id, session=session)
+    return True
@@ -1,48 +1,299 @@
+import asyncio
+from typing import AsyncIterator
+
 from aioboto3.session import Session
-from contextlib import asynccontextmanager
+from aiobotocore.config import AioConfig
+from contextlib import AsyncExitStack, asynccontextmanager
+from redis.exceptions import LockError, RedisError
+
+from app.core import metrics
 from app.core.config import config
-from app.core.logger import logger
+from app.core.logger import get_logger
+from app.core.redis import RedisManager
+
+logger = get_logger(__name__)
 
 class S3Client:
     def __init__(
-        self, 
-        aws_access_key_id: str, 
-        aws_secret_access_key: str, 
-        endpoint_url: str, 
-        bucket_name: str
+        self,
+        aws_access_key_id: str,
+        aws_secret_access_key: str,
+        endpoint_url: str,
+        bucket_name: str,
+        redis_manager: RedisManager | None = None
     ):
         self.config: dict = {
             "aws_access_key_id": aws_access_key_id,
             "aws_secret_access_key": aws_secret_access_key,
-            "endpoint_url": endpoint_url
+            "endpoint_url": endpoint_url,
+            "config": AioConfig(
+                max_pool_connections=config.S3_MAX_POOL_CONNECTIONS,
+                tcp_keepalive=True,
+                connector_args={"keepalive_timeout": config.S3_KEEPALIVE_TIMEOUT},
+            ),
         }
         self.bucket_name: str = bucket_name
         self.session: Session = Session()
+        self._client = None
+        self._exit_stack: AsyncExitStack | None = None
+        self.redis_manager: RedisManager | None = redis_manager
+        # strong references to running refresh-ahead tasks
+        self._refresh_tasks: set[asyncio.Task] = set()
+        self._upload_slots: asyncio.Semaphore = asyncio.Semaphore(config.S3_MAX_CONCURRENT_UPLOADS)
+        # shared by every batch on this worker, not per request
+        self._signing_slots: asyncio.Semaphore = asyncio.Semaphore(config.S3_MAX_CONCURRENCY)
+
+    async def connect(self) -> None:
+        # one botocore client and connection pool shared by all requests
+        self._exit_stack = AsyncExitStack()
+        self._client = await self._exit_stack.enter_async_context(
+            self.session.client("s3", **self.config)
+        )
 
     @asynccontextmanager
     async def get_client(self):
+        if self._client is not None:
+            yield self._client
+            return
+        # not connected (one-off scripts), fall back to a short-lived client
         async with self.session.client("s3", **self.config) as client:
             yield client
 
+    @metrics.timed(metrics.S3_LATENCY, "upload_file")
     async def upload_file(self, file_obj, object_name: str) -> None:
         async with self.get_client() as client:
             await client.upload_fileobj(file_obj, self.bucket_name, object_name)
-        logger.info(f"File {object_name} uploaded to S3")
+        logger.info("File %s uploaded to S3", object_name)
+
+    @metrics.timed(metrics.S3_LATENCY, "upload_stream")
+    async def upload_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        object_name: str,
+        content_type: str
+    ) -> int:
+        # buffers at most one part; bodies that fit into a single part go out
+        # as one PutObject, larger ones as a multipart upload
+        async with self._upload_slots, self.get_client() as client:
+            buffer: bytearray = bytearray()
+            size: int = 0
+            upload_id: str | None = None
+            parts: list[dict] = []
+            try:
+                async for chunk in chunks:
+                    buffer.extend(chunk)
+                    size += len(chunk)
+                    if len(buffer) < config.S3_MULTIPART_PART_SIZE:
+                        continue
+                    if upload_id is None:
+                        response: dict = await client.create_multipart_upload(
+                            Bucket=self.bucket_name, Key=object_name, ContentType=content_type
+                        )
+                        upload_id = response["UploadId"]
+                    parts.append(await self._upload_part(client, object_name, upload_id, len(parts) + 1, buffer))
+                    buffer = bytearray()
 
+                if upload_id is None:
+                    await client.put_object(
+                        Bucket=self.bucket_name, Key=object_name, Body=bytes(buffer), ContentType=content_type
+                    )
+                else:
+                    if buffer:
+                        parts.append(await self._upload_part(client, object_name, upload_id, len(parts) + 1, buffer))
+                    await client.complete_multipart_upload(
+                        Bucket=self.bucket_name,
+                        Key=object_name,
+                        UploadId=upload_id,
+                        MultipartUpload={"Parts": parts},
+                    )
+            except BaseException:
+                if upload_id is not None:
+                    await client.abort_multipart_upload(
+                        Bucket=self.bucket_name, Key=object_name, UploadId=upload_id
+                    )
+                raise
+        logger.info("File %s streamed to S3 (%s bytes)", object_name, size)
+        return size
+
+    @metrics.timed(metrics.S3_LATENCY, "upload_bytes")
+    async def upload_bytes(self, data: bytes, object_name: str, content_type: str) -> None:
+        async with self._upload_slots, self.get_client() as client:
+            await client.put_object(
+                Bucket=self.bucket_name, Key=object_name, Body=data, ContentType=content_type
+            )
+        logger.info("File %s uploaded to S3", object_name)
+
+    @metrics.timed(metrics.S3_LATENCY, "get_object_url")
     async def get_object_url(self, object_name: str) -> str:
-        #TODO: REDIS CASH
+        if self.redis_manager is None:
+            return await self._generate_object_url(object_name)
+
+        try:
+            url, ttl = await self.redis_manager.get_cached_object_url(object_name)
+        except RedisError as e:
+            logger.warning("URL cache unavailable for %s: %s", object_name, e)
+            metrics.record_cache("s3_url", errors=1)
+            return await self._generate_object_url(object_name)
+
+        metrics.record_cache("s3_url", hits=int(url is not None), misses=int(url is None))
+        if url is None:
+            return await self._generate_cached_object_url(object_name)
+        if ttl < config.IMAGE_URL_REFRESH_AHEAD:
+            self._schedule_refresh(object_name)
+        return url
+
+    @metrics.timed(metrics.S3_LATENCY, "get_object_urls")
+    async def get_object_urls(self, object_names: list[str]) -> dict[str, str]:
+        # one Redis round trip for the whole batch, misses are signed
+        # concurrently with at most S3_MAX_CONCURRENCY in flight per worker
+        object_names = list(dict.fromkeys(object_names))
+        if not object_names:
+            return {}
+
+        urls: dict[str, str] = {}
+        if self.redis_manager is not None:
+            try:
+                cached = await self.redis_manager.get_cached_object_urls(object_names)
+            except RedisError as e:
+                logger.warning("URL cache unavailable for batch: %s", e)
+                metrics.record_cache("s3_url", errors=len(object_names))
+                cached = {}
+            for object_name, (url, ttl) in cached.items():
+                if url is None:
+                    continue
+                if ttl < config.IMAGE_URL_REFRESH_AHEAD:
+                    self._schedule_refresh(object_name)
+                urls[object_name] = url
+            if cached:
+                metrics.record_cache("s3_url", hits=len(urls), misses=len(object_names) - len(urls))
+
+        async def generate(object_name: str) -> tuple[str, str]:
+            async with self._signing_slots:
+                if self.redis_manager is None:
+                    return object_name, await self._generate_object_url(object_name)
+                return object_name, await self._generate_cached_object_url(object_name)
+
+        misses: list[str] = [name for name in object_names if name not in urls]
+        urls.update(await asyncio.gather(*(generate(name) for name in misses)))
+        return urls
+
+    @metrics.timed(metrics.S3_LATENCY, "delete_asset")
+    async def delete_asset(self, file_name: str) -> None:
+        async with self.get_client() as client:
+            await client.delete_object(Bucket=self.bucket_name, Key=file_name)
+        logger.info("File %s deleted", file_name)
+        await self._forget_object_urls([file_name])
+
+    async def iter_objects(self, prefix: str = "", page_size: int = 1000) -> AsyncIterator[dict]:
+        # ListObjectsV2 pages, keys come back in UTF-8 binary order
+        async with self.get_client() as client:
+            paginator = client.get_paginator("list_objects_v2")
+            async for page in paginator.paginate(
+                Bucket=self.bucket_name, Prefix=prefix, PaginationConfig={"PageSize": page_size}
+            ):
+                for obj in page.get("Contents", []):
+                    yield obj
+
+    @metrics.timed(metrics.S3_LATENCY, "delete_assets")
+    async def delete_assets(self, file_names: list[str]) -> dict[str, str]:
+        # DeleteObjects takes up to 1000 keys per call; returns failed keys with reasons
+        errors: dict[str, str] = {}
+        async with self.get_client() as client:
+            for i in range(0, len(file_names), 1000):
+                batch: list[str] = file_names[i:i + 1000]
+                response: dict = await client.delete_objects(
+                    Bucket=self.bucket_name,
+                    Delete={"Objects": [{"Key": name} for name in batch], "Quiet": True},
+                )
+                for error in response.get("Errors", []):
+                    errors[error["Key"]] = f"{error.get('Code')}: {error.get('Message')}"
+        logger.info("%s files deleted, %s failed", len(file_names) - len(errors), len(errors))
+        await self._forget_object_urls([name for name in file_names if name not in errors])
+        return errors
+
+    async def close(self) -> None:
+        for task in list(self._refresh_tasks):
+            task.cancel()
+        await asyncio.gather(*self._refresh_tasks, return_exceptions=True)
+        if self._exit_stack is not None:
+            await self._exit_stack.aclose()
+        self._client = None
+        self._exit_stack = None
+
+    @metrics.timed(metrics.S3_LATENCY, "presign")
+    async def _generate_object_url(self, object_name: str) -> str:
         async with self.get_client() as client:
             url: str = await client.generate_presigned_url(
                 "get_object",
                 Params={"Bucket": self.bucket_name, "Key": object_name},
                 ExpiresIn=config.IMAGE_EXPIRE_TIME,
             )
-            logger.info(f"URL for file {object_name} generated")
+            logger.info("URL for file %s generated", object_name)
             return url
 
-    async def delete_asset(self, file_name: str) -> None:
-        async with self.get_client() as client:
-            await client.delete_object(Bucket=self.bucket_name, Key=file_name)
-        logger.info(f"File {file_name} deleted")
-        
-          
+    async def _generate_cached_object_url(self, object_name: str) -> str:
+        # only the lock holder signs and stores the URL, concurrent misses
+        # wait for it instead of all signing the same key at once
+        lock = self.redis_manager.lock(f"s3url:{object_name}", timeout=config.IMAGE_URL_LOCK_TIMEOUT)
+        try:
+            if await lock.acquire(blocking=False):
+                try:
+                    url: str = await self._generate_object_url(object_name)
+                    await self.redis_manager.cache_object_url(object_name, url)
+                    return url
+                finally:
+                    await self._release(lock)
+
+            for _ in range(config.IMAGE_URL_LOCK_TIMEOUT * 20):
+                await asyncio.sleep(0.05)
+                url, _ = await self.redis_manager.get_cached_object_url(object_name)
+                if url is not None:
+                    return url
+        except RedisError as e:
+            logger.warning("URL cache unavailable for %s: %s", object_name, e)
+        return await self._generate_object_url(object_name)
+
+    def _schedule_refresh(self, object_name: str) -> None:
+        task: asyncio.Task = asyncio.create_task(self._refresh_object_url(object_name))
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def _refresh_object_url(self, object_name: str) -> None:
+        lock = self.redis_manager.lock(f"s3url:{object_name}", timeout=config.IMAGE_URL_LOCK_TIMEOUT)
+        try:
+            if not await lock.acquire(blocking=False):
+                return
+            try:
+                url: str = await self._generate_object_url(object_name)
+                await self.redis_manager.cache_object_url(object_name, url)
+            finally:
+                await self._release(lock)
+        except Exception as e:
+            logger.warning("Failed to refresh URL for %s: %s", object_name, e)
+
+    async def _forget_object_urls(self, object_names: list[str]) -> None:
+        if self.redis_manager is None or not object_names:
+            return
+        try:
+            await self.redis_manager.delete_cached_object_urls(object_names)
+        except RedisError as e:
+            logger.warning("Failed to drop cached URLs for %s files: %s", len(object_names), e)
+
+    @metrics.timed(metrics.S3_LATENCY, "upload_part")
+    async def _upload_part(self, client, object_name: str, upload_id: str, part_number: int, body: bytearray) -> dict:
+        response: dict = await client.upload_part(
+            Bucket=self.bucket_name,
+            Key=object_name,
+            UploadId=upload_id,
+            PartNumber=part_number,
+            Body=bytes(body),
+        )
+        return {"ETag": response["ETag"], "PartNumber": part_number}
+
+    @staticmethod
+    async def _release(lock) -> None:
+        try:
+            await lock.release()
+        except LockError:
+            # lock expired while signing, another worker may own it now
+            pass
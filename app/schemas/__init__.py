@@ -1 +1 @@
-from . import cards, socials, assets, codes
\ No newline at end of file
+from . import cards, socials, assets, codes, system
\ No newline at end of file
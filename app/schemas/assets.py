@@ -25,6 +25,12 @@ class In(BaseModel):
     )
 
 
+class LogoForm(BaseModel):
+    """Form fields sent before the file in a social icon upload."""
+    
+    social_id: int = Field(..., ge=1, description="Social link ID")
+
+
 class Base(BaseModel):
     """Base asset schema."""
     
@@ -34,6 +40,7 @@ class Base(BaseModel):
     card_id: int = Field(..., description="Card ID")
     type: enums.AssetType = Field(..., description="Asset type")
     file_name: str = Field(..., description="S3 file name")
+    renditions: dict[str, str] | None = Field(None, description="Rendition S3 file names")
     created_at: datetime = Field(..., description="Upload date")
 
 
@@ -6,8 +6,11 @@ Used for validating input data and formatting API responses.
 import re
 from datetime import datetime
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from typing import Literal
 
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+
+from app.core.config import config
 from app.schemas.socials import Out as SocialOut
 
 
@@ -142,7 +145,7 @@ class Base(BaseModel):
     description: str = Field(..., description="Description")
     phone: str = Field(..., description="Phone number")
     email: str = Field(..., description="Email")
-    website: str = Field(..., description="Website")
+    website: str | None = Field(None, description="Website")
     city: str = Field(..., description="City")
     is_active: bool = Field(..., description="Whether card is active")
     created_at: datetime = Field(..., description="Creation date")
@@ -154,6 +157,89 @@ class Out(Base):
     
     socials: list[SocialOut] = Field(default=[], description="List of social links")
     avatar_link: str | None = Field(None, description="Avatar URL")
+    avatar_renditions: dict[str, str] | None = Field(
+        None,
+        description="Resized avatar URLs by rendition (webp_64, webp_256, webp_512, jpeg_512)"
+    )
+
+
+class Filter(BaseModel):
+    """Admin filter for selecting cards."""
+    
+    is_active: bool | None = Field(None, description="Only active or only inactive cards")
+    city: str | None = Field(None, description="Exact city match")
+    created_from: datetime | None = Field(None, description="Created at or after (UTC)")
+    created_to: datetime | None = Field(None, description="Created before (UTC)")
+
+
+class AdminItem(Base):
+    """Card row in admin listing."""
+    
+    social_count: int | None = Field(None, description="Number of social links (with_stats only)")
+    has_avatar: bool | None = Field(None, description="Whether avatar is uploaded (with_stats only)")
+
+
+class Page(BaseModel):
+    """Keyset-paginated admin card listing."""
+    
+    items: list[AdminItem] = Field(default=[], description="Cards ordered by ID")
+    next_cursor: int | None = Field(None, description="Pass as after_id to get the next page")
+
+
+class BulkIn(BaseModel):
+    """Request schema for provisioning a batch of cards."""
+    
+    cards: list[In] = Field(
+        ...,
+        min_length=1,
+        max_length=config.BULK_MAX_CARDS,
+        description="Cards to create"
+    )
+
+
+BulkFormat = Literal["csv", "ndjson"]
+
+
+BulkAction = Literal["regenerate_codes", "activate", "deactivate", "delete"]
+
+
+class BulkActionIn(BaseModel):
+    """Request schema for a bulk admin action."""
+    
+    action: BulkAction = Field(..., description="Action to perform")
+    card_ids: list[int] | None = Field(
+        None,
+        min_length=1,
+        max_length=config.BULK_MAX_CARDS,
+        description="Target card IDs",
+        json_schema_extra={"example": [1, 2, 3]}
+    )
+    filter: Filter | None = Field(None, description="Target every card matching the filter")
+
+    @model_validator(mode="after")
+    def validate_target(self) -> "BulkActionIn":
+        if (self.card_ids is None) == (self.filter is None):
+            raise ValueError("Exactly one of card_ids or filter must be set")
+        # an empty filter adds no WHERE clause and would target every card
+        if self.filter is not None and all(value is None for value in self.filter.model_dump().values()):
+            raise ValueError("Filter must set at least one field")
+        return self
+
+
+class BulkItem(BaseModel):
+    """Result of a bulk action for one card."""
+    
+    card_id: int = Field(..., description="Card ID")
+    status: Literal["ok", "not_found"] = Field(..., description="Outcome")
+    code: str | None = Field(None, description="New activation code (regenerate_codes only)")
+
+
+class BulkActionOut(BaseModel):
+    """Response schema for a bulk admin action."""
+    
+    action: BulkAction = Field(..., description="Performed action")
+    processed: int = Field(..., description="Number of affected cards")
+    items: list[BulkItem] = Field(default=[], description="Per-card results")
 
 
 class OnCreate(Out):
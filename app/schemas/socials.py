@@ -57,4 +57,8 @@ class Base(BaseModel):
 class Out(Base):
     """Social link response schema."""
     
-    app_icon_link: str | None = Field(None, description="Custom icon URL")
\ No newline at end of file
+    app_icon_link: str | None = Field(None, description="Custom icon URL")
+    app_icon_renditions: dict[str, str] | None = Field(
+        None,
+        description="Resized icon URLs by rendition (webp_64, webp_256, webp_512, jpeg_512)"
+    )
\ No newline at end of file
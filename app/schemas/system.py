@@ -0,0 +1,38 @@
+"""
+System schemas.
+
+Used for admin monitoring endpoints.
+"""
+from pydantic import BaseModel, Field
+
+from app.core.config import config
+
+
+class PoolStatus(BaseModel):
+    """Database connection pool state of the answering worker process."""
+    
+    size: int = Field(..., description="Configured pool size")
+    checked_in: int = Field(..., description="Idle connections in the pool")
+    checked_out: int = Field(..., description="Connections in use")
+    overflow: int = Field(..., description="Connections above pool size (negative while the pool fills)")
+    max_overflow: int = Field(..., description="Configured overflow limit")
+    checkouts: int = Field(..., description="Checkouts since start")
+    timeouts: int = Field(..., description="Checkouts that timed out waiting for a connection")
+    wait_total_seconds: float = Field(..., description="Total time spent checking out connections")
+    wait_max_seconds: float = Field(..., description="Longest single checkout")
+
+
+class ProfileWindowIn(BaseModel):
+    """Window of requests to profile on the answering worker process."""
+    
+    requests: int = Field(..., ge=1, le=config.PROFILE_MAX_WINDOW, description="Requests to profile")
+    path_prefix: str | None = Field(None, description="Only profile paths starting with it, e.g. /v1/cards/")
+
+
+class ProfileWindowOut(BaseModel):
+    """Armed profiling window."""
+    
+    profile_id: str = Field(..., description="Profile to fetch from /system/profiles/{profile_id}/")
+    requests: int = Field(..., description="Requests to profile")
+    path_prefix: str | None = Field(None, description="Path filter")
+    pid: int = Field(..., description="Worker process the window is armed on")
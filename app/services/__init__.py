@@ -1,2 +1,2 @@
-from . import cards, codes, avatars, logos, socials
-__all__ = ["cards", "codes", "avatars", "logos", "socials"]
\ No newline at end of file
+from . import card_cache, images, cards, codes, avatars, logos, outbox, socials
+__all__ = ["card_cache", "images", "cards", "codes", "avatars", "logos", "outbox", "socials"]
\ No newline at end of file
@@ -3,13 +3,17 @@ Avatar service.
 
 Contains business logic for getting and uploading avatars.
 """
-from fastapi import UploadFile
+from concurrent.futures import Executor
+from typing import AsyncIterator
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import repo, schemas
 from app.core import enums, models
 from app.core.config import config
+from app.core.redis import RedisManager
 from app.s3.client import S3Client
+from app.services import card_cache, images
 
 
 async def get(
@@ -40,29 +44,47 @@ async def get(
 
 
 async def upload(
-    card: models.Card, 
+    card_id: int, 
     s3_client: S3Client, 
-    file: UploadFile, 
-    session: AsyncSession
+    content_type: str,
+    chunks: AsyncIterator[bytes],
+    image_pool: Executor,
+    session: AsyncSession,
+    redis_manager: RedisManager
 ) -> schemas.assets.Out:
     """
     Upload avatar for card.
     
+    The file and its renditions are stored in S3 first, so an aborted
+    upload never leaves a database row pointing at a missing object.
+    
     Args:
-        card: Validated card object
+        card_id: Validated card ID
         s3_client: S3 client for upload
-        file: Image file
+        content_type: Validated image MIME type
+        chunks: Validated image body chunks
+        image_pool: Process pool for rendering renditions
         session: Database session
+        redis_manager: Redis manager for cache invalidation
         
     Returns:
         schemas.assets.Out: Uploaded asset info
     """
-    file_name: str = config.S3_AVATAR_TEMPLATE.format(card_id=card.id)
-    asset: models.Asset = await repo.avatars.create(
-        card_id=card.id, 
+    file_name: str = config.S3_AVATAR_TEMPLATE.format(card_id=card_id)
+    renditions: dict[str, str] = await images.store(
+        file_name=file_name,
+        content_type=content_type,
+        chunks=chunks,
+        s3_client=s3_client,
+        image_pool=image_pool
+    )
+    asset: models.CardAsset = await repo.avatars.create(
+        card_id=card_id, 
         file_name=file_name, 
+        renditions=renditions,
         session=session
     )
-    await s3_client.upload_file(file_obj=file, object_name=file_name)
+    await session.commit()
+    await card_cache.invalidate(card_id=card_id, redis_manager=redis_manager)
     
     return schemas.assets.Out.model_validate(asset, from_attributes=True)
\ No newline at end of file
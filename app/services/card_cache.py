@@ -0,0 +1,138 @@
+"""
+Rendered card cache service.
+
+Keeps serialized public cards in Redis so repeated taps skip Postgres and S3.
+Every write to a card, its socials or its assets must call invalidate().
+"""
+import json
+from datetime import datetime
+
+from redis.exceptions import RedisError
+
+from app import schemas
+from app.core import metrics
+from app.core.logger import get_logger
+from app.core.redis import RedisManager
+
+logger = get_logger(__name__)
+
+
+async def get(
+    card_id: int,
+    redis_manager: RedisManager
+) -> tuple[str | None, str | None]:
+    """
+    Get rendered card from cache.
+
+    Args:
+        card_id: Card ID
+        redis_manager: Redis manager
+
+    Returns:
+        tuple[str | None, str | None]: Cached JSON (None on miss) and the
+            version to pass to store() (None if cache is unavailable)
+    """
+    try:
+        cached, version = await redis_manager.get_cached_card(card_id)
+    except RedisError as e:
+        logger.warning("Card cache unavailable for card %s: %s", card_id, e)
+        metrics.record_cache("card", errors=1)
+        return None, None
+    metrics.record_cache("card", hits=int(cached is not None), misses=int(cached is None))
+    return cached, version
+
+
+def get_updated_at(payload: str) -> datetime:
+    """
+    Get version of a cached card.
+
+    Args:
+        payload: Cached JSON returned by get()
+
+    Returns:
+        datetime: Card updated_at
+    """
+    return datetime.fromisoformat(json.loads(payload)["updated_at"])
+
+
+async def store(
+    card: schemas.cards.Out,
+    version: str | None,
+    redis_manager: RedisManager
+) -> None:
+    """
+    Store rendered card in cache.
+
+    Skipped if the card was invalidated after version was read.
+
+    Args:
+        card: Rendered card
+        version: Version returned by get()
+        redis_manager: Redis manager
+    """
+    if version is None:
+        return
+    try:
+        await redis_manager.cache_card(card.id, card.model_dump_json(), version)
+    except RedisError as e:
+        logger.warning("Failed to cache card %s: %s", card.id, e)
+
+
+async def is_pinned(
+    card_id: int,
+    redis_manager: RedisManager
+) -> bool:
+    """
+    Check whether card reads must stay on the primary database.
+
+    A card is pinned for DB_REPLICA_PIN_SECONDS after every invalidation,
+    so editors read their own writes while the replica catches up.
+
+    Args:
+        card_id: Card ID
+        redis_manager: Redis manager
+
+    Returns:
+        bool: True if pinned, or if Redis cannot tell
+    """
+    try:
+        return await redis_manager.is_card_pinned(card_id)
+    except RedisError as e:
+        logger.warning("Read pin unavailable for card %s: %s", card_id, e)
+        return True
+
+
+async def invalidate(
+    card_id: int,
+    redis_manager: RedisManager
+) -> None:
+    """
+    Drop rendered card from cache.
+
+    Args:
+        card_id: Card ID
+        redis_manager: Redis manager
+    """
+    try:
+        await redis_manager.invalidate_card(card_id)
+    except RedisError as e:
+        logger.error("Failed to invalidate cached card %s: %s", card_id, e)
+
+
+async def invalidate_many(
+    card_ids: list[int],
+    redis_manager: RedisManager
+) -> None:
+    """
+    Drop rendered cards from cache in one round trip.
+
+    Args:
+        card_ids: Card IDs
+        redis_manager: Redis manager
+    """
+    if not card_ids:
+        return
+    try:
+        await redis_manager.invalidate_cards(card_ids)
+    except RedisError as e:
+        logger.error("Failed to invalidate %s cached cards: %s", len(card_ids), e)
@@ -6,37 +6,60 @@ Contains business logic for creating, getting and updating cards.
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import repo, schemas, utils
-from app.core import models
+from app.core import enums, models
 from app.core.config import config
+from app.core.redis import RedisManager
 from app.s3.client import S3Client
-from app.services import avatars, logos
+from app.services import avatars, card_cache, codes, images, logos
 
 
 async def get(
     s3_client: S3Client, 
     card: models.Card, 
-    session: AsyncSession
+    redis_manager: RedisManager | None = None,
+    cache_version: str | None = None
 ) -> schemas.cards.Out:
     """
     Get card with all related data.
     
     Args:
         s3_client: S3 client for getting URLs
-        card: Card object
-        session: Database session
+        card: Card object with socials and assets loaded
+        redis_manager: Redis manager for caching the rendered card
+        cache_version: Cache version returned by card_cache.get
         
     Returns:
         schemas.cards.Out: Card with socials and avatar
     """
-    logos_dict: dict[int, str] = await logos.get_all(card_id=card.id, s3_client=s3_client, session=session)
+    avatar: models.CardAsset | None = next(
+        (asset for asset in card.assets if asset.type == enums.AssetType.avatar),
+        None
+    )
+    icons: dict[int, models.CardAsset] = {
+        asset.id: asset
+        for asset in card.assets
+        if asset.type == enums.AssetType.app_icon
+    }
+
+    # presigning for the avatar and every icon goes out as one batch
+    assets: list[models.CardAsset] = [*icons.values(), *([avatar] if avatar else [])]
+    urls: dict[str, str] = await s3_client.get_object_urls(
+        [key for asset in assets for key in images.asset_keys(asset)]
+    )
 
-    avatar: CardAsset | None = await repo.avatars.get(card_id=card.id, session=session)
-    avatar_link: str | None = await s3_client.get_object_url(avatar.file_name) if avatar else None
     for social in card.socials:
-        social.app_icon_link = logos_dict.get(social.icon_asset_id)
-    card.avatar_link = avatar_link
+        icon: models.CardAsset | None = icons.get(social.icon_asset_id)
+        social.app_icon_link, social.app_icon_renditions = (
+            images.asset_links(icon, urls) if icon else (None, None)
+        )
+    card.avatar_link, card.avatar_renditions = (
+        images.asset_links(avatar, urls) if avatar else (None, None)
+    )
 
-    return schemas.cards.Out.model_validate(card, from_attributes=True)
+    card_out: schemas.cards.Out = schemas.cards.Out.model_validate(card, from_attributes=True)
+    if redis_manager:
+        await card_cache.store(card=card_out, version=cache_version, redis_manager=redis_manager)
+    return card_out
 
 async def create(
     card: schemas.cards.In, 
@@ -62,15 +85,52 @@ async def create(
         is_active=True
     )
     code: models.Code = await repo.codes.create(code=code, session=session)
+    await session.commit()
     card_schema: schemas.cards.Base = schemas.cards.Base.model_validate(card, from_attributes=True)
 
     return utils.utils.build_schema(schemas.cards.OnCreate, card_schema, avatar_link=None, code=generated_code)
 
 
+async def create_many(
+    bulk: schemas.cards.BulkIn,
+    session: AsyncSession
+) -> list[dict]:
+    """
+    Create a batch of cards with codes in one transaction.
+    
+    Args:
+        bulk: Cards to create
+        session: Database session
+        
+    Returns:
+        list[dict]: Card ID and plaintext activation code per card, in input order
+    """
+    card_ids: list[int] = await repo.cards.create_many(
+        cards=[card.model_dump() for card in bulk.cards],
+        session=session
+    )
+
+    generated_codes: list[str] = [utils.code.generate() for _ in card_ids]
+    await repo.codes.create_many(
+        codes=[
+            {"card_id": card_id, "code_hash": utils.code.encode(code), "is_active": True}
+            for card_id, code in zip(card_ids, generated_codes)
+        ],
+        session=session
+    )
+    await session.commit()
+
+    return [
+        {"card_id": card_id, "code": code}
+        for card_id, code in zip(card_ids, generated_codes)
+    ]
+
+
 async def update(
     card: models.Card, 
     card_update: schemas.cards.Patch, 
-    session: AsyncSession
+    session: AsyncSession,
+    redis_manager: RedisManager
 ) -> schemas.cards.Base:
     """
     Update card.
@@ -79,6 +139,7 @@ async def update(
         card: Card object to update
         card_update: Update data
         session: Database session
+        redis_manager: Redis manager for cache invalidation
         
     Returns:
         schemas.cards.Base: Updated card
@@ -88,71 +149,154 @@ async def update(
         card_update=card_update.model_dump(exclude_unset=True), 
         session=session
     )
+    await session.commit()
+    await card_cache.invalidate(card_id=card.id, redis_manager=redis_manager)
     
     return schemas.cards.Base.model_validate(updated_card)
 
 
-async def get_all(session: AsyncSession) -> list[schemas.cards.Out]:
+async def get_page(
+    after_id: int | None,
+    limit: int,
+    filters: schemas.cards.Filter,
+    with_stats: bool,
+    session: AsyncSession
+) -> schemas.cards.Page:
     """
-    Get all cards.
+    Get a page of cards for admin listing.
     
     Args:
+        after_id: Last card ID of the previous page
+        limit: Page size
+        filters: Card filter
+        with_stats: Whether to count socials and check avatars
         session: Database session
         
     Returns:
-        list[schemas.cards.Out]: List of cards
+        schemas.cards.Page: Cards and cursor of the next page
     """
-    cards = await repo.cards.get_all(session=session)
-    # TODO: populate avatar and socials? For now returning as is, 
-    # but schema might require them. 
-    # For simplicity in admin list, we might not need full details yet.
-    return [
-        utils.utils.build_schema(schemas.cards.Out, card, socials=[], avatar_link=None)
-        for card in cards
+    # one extra row tells whether another page exists without a COUNT(*)
+    rows = await repo.cards.get_page(
+        after_id=after_id,
+        limit=limit + 1,
+        filters=filters,
+        with_stats=with_stats,
+        session=session
+    )
+    items: list[schemas.cards.AdminItem] = [
+        utils.utils.build_schema(
+            schemas.cards.AdminItem,
+            schemas.cards.Base.model_validate(card),
+            social_count=social_count,
+            has_avatar=has_avatar
+        )
+        for card, social_count, has_avatar in rows[:limit]
     ]
+    next_cursor: int | None = items[-1].id if len(rows) > limit else None
+    return schemas.cards.Page(items=items, next_cursor=next_cursor)
 
 
 async def delete(
     card_id: int, 
     session: AsyncSession,
-    s3_client: S3Client
-) -> None:
+    redis_manager: RedisManager
+) -> bool:
     """
     Delete card and all associated assets.
     
+    S3 objects are queued in the outbox within the same transaction and
+    removed by the outbox worker.
+    
     Args:
         card_id: Card ID
         session: Database session
-        s3_client: S3 client
+        redis_manager: Redis manager for cache invalidation
+        
+    Returns:
+        bool: False if card does not exist
     """
-    card = await repo.cards.get(card_id=card_id, session=session)
+    card: models.Card | None = await repo.cards.get_full(card_id=card_id, session=session)
     if not card:
-        return
-
-    # Delete avatar
-    avatar_link = await avatars.get(card_id=card.id, s3_client=s3_client, session=session)
-    if avatar_link:
-       # We need to delete the file, but avatars.get returns URL.
-       # We should use repo to find asset and delete it.
-       pass # TODO: implement proper cleanup
-       
-    # Actually, repo.cards.delete doesn't cascade delete assets effectively from S3, 
-    # only from DB if configured.
-    # We should probably manually delete S3 files.
+        return False
+
+    await repo.outbox.add(
+        object_names=[name for asset in card.assets for name in images.object_names(asset)],
+        session=session
+    )
+    await repo.cards.delete(card_id=card.id, session=session)
+    await session.commit()
+    await card_cache.invalidate(card_id=card.id, redis_manager=redis_manager)
+    return True
+
+
+async def delete_many(
+    card_ids: list[int],
+    session: AsyncSession,
+    redis_manager: RedisManager
+) -> None:
+    """
+    Delete a batch of cards and all associated assets.
     
-    # 1. Delete avatar
-    avatar_asset = await repo.avatars.get(card_id=card.id, session=session)
-    if avatar_asset:
-        await s3_client.delete_asset(config.S3_AVATAR_TEMPLATE.format(card_id=card.id))
-        
-    # 2. Delete social icons
-    socials = await repo.socials.get_all(card_id=card.id, session=session)
-    for social in socials:
-        if social.icon_asset_id:
-             await s3_client.delete_asset(
-                 config.S3_ICON_TEMPLATE.format(card_id=card.id, social_id=social.id)
-             )
+    S3 objects are queued in the outbox within the same transaction and
+    removed by the outbox worker with batched DeleteObjects calls.
+    
+    Args:
+        card_ids: IDs of existing cards
+        session: Database session
+        redis_manager: Redis manager for cache invalidation
+    """
+    assets: list[models.CardAsset] = await repo.assets.get_by_cards(card_ids=card_ids, session=session)
+    await repo.outbox.add(
+        object_names=[name for asset in assets for name in images.object_names(asset)],
+        session=session
+    )
+    await repo.cards.delete_many(card_ids=card_ids, session=session)
+    await session.commit()
+    await card_cache.invalidate_many(card_ids=card_ids, redis_manager=redis_manager)
 
-    await repo.cards.delete(card=card, session=session)
 
-    
\ No newline at end of file
+async def apply_bulk(
+    bulk: schemas.cards.BulkActionIn,
+    card_ids: list[int],
+    session: AsyncSession,
+    redis_manager: RedisManager
+) -> schemas.cards.BulkActionOut:
+    """
+    Perform a bulk admin action with set-based statements.
+    
+    Args:
+        bulk: Bulk action
+        card_ids: IDs of existing target cards
+        session: Database session
+        redis_manager: Redis manager for cache invalidation
+        
+    Returns:
+        schemas.cards.BulkActionOut: Per-card results
+    """
+    new_codes: dict[int, str] = {}
+    if card_ids:
+        if bulk.action == "regenerate_codes":
+            new_codes = await codes.regenerate_many(card_ids=card_ids, session=session)
+        elif bulk.action == "delete":
+            await delete_many(card_ids=card_ids, session=session, redis_manager=redis_manager)
+        else:
+            await repo.cards.set_active(
+                card_ids=card_ids,
+                is_active=bulk.action == "activate",
+                session=session
+            )
+            await session.commit()
+            await card_cache.invalidate_many(card_ids=card_ids, redis_manager=redis_manager)
+
+    items: list[schemas.cards.BulkItem] = [
+        schemas.cards.BulkItem(card_id=card_id, status="ok", code=new_codes.get(card_id))
+        for card_id in card_ids
+    ]
+    if bulk.card_ids is not None:
+        found: set[int] = set(card_ids)
+        items.extend(
+            schemas.cards.BulkItem(card_id=card_id, status="not_found")
+            for card_id in dict.fromkeys(bulk.card_ids)
+            if card_id not in found
+        )
+    return schemas.cards.BulkActionOut(action=bulk.action, processed=len(card_ids), items=items)
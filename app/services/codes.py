@@ -65,8 +65,37 @@ async def regenerate(
         is_active=True
     )
     await repo.codes.create(code=code, session=session)
+    await session.commit()
     
     return schemas.codes.RegenerateOut(
         card_id=card.id,
         code=generated_code
     )
+
+
+async def regenerate_many(
+    card_ids: list[int],
+    session: AsyncSession
+) -> dict[int, str]:
+    """
+    Regenerate codes for a batch of cards in one transaction.
+    
+    Args:
+        card_ids: IDs of existing cards
+        session: Database session
+        
+    Returns:
+        dict[int, str]: New activation code by card ID
+    """
+    generated_codes: dict[int, str] = {card_id: utils.code.generate() for card_id in card_ids}
+
+    await repo.codes.deactivate_many(card_ids=card_ids, session=session)
+    await repo.codes.create_many(
+        codes=[
+            {"card_id": card_id, "code_hash": utils.code.encode(code), "is_active": True}
+            for card_id, code in generated_codes.items()
+        ],
+        session=session
+    )
+    await session.commit()
+    return generated_codes
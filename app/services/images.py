@@ -0,0 +1,139 @@
+"""
+Image pipeline service.
+
+Stores an uploaded image together with its resized renditions.
+"""
+import asyncio
+from concurrent.futures import Executor
+from typing import AsyncIterator
+
+from fastapi import HTTPException, status
+
+from app import utils
+from app.core import models
+from app.core.config import config
+from app.s3.client import S3Client
+
+
+async def store(
+    file_name: str,
+    content_type: str,
+    chunks: AsyncIterator[bytes],
+    s3_client: S3Client,
+    image_pool: Executor
+) -> dict[str, str]:
+    """
+    Upload original image and its renditions.
+
+    The body is buffered, bounded by IMAGE_MAX_SIZE through the validated
+    chunk iterator, and decoded before anything is written: the keys are
+    deterministic, so a bad re-upload must not touch the objects the
+    current asset row points at. Decoding and encoding run in the image
+    process pool. The original then goes through the streaming upload
+    (multipart above S3_MULTIPART_PART_SIZE), its renditions as single
+    PutObjects; all of them share the client's upload slots.
+
+    Args:
+        file_name: S3 key of the original
+        content_type: Validated image MIME type
+        chunks: Validated image body chunks
+        s3_client: S3 client for upload
+        image_pool: Process pool for image processing
+
+    Returns:
+        dict[str, str]: Rendition name to S3 key
+
+    Raises:
+        HTTPException: 400 if image cannot be decoded
+    """
+    body: bytearray = bytearray()
+    async for chunk in chunks:
+        body.extend(chunk)
+    original: bytes = bytes(body)
+
+    loop = asyncio.get_running_loop()
+    try:
+        renditions: dict[str, tuple[bytes, str]] = await loop.run_in_executor(
+            image_pool, utils.images.render, original, config.IMAGE_RENDITION_SIZES
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    keys: dict[str, str] = {
+        name: utils.images.rendition_key(file_name, name)
+        for name in renditions
+    }
+
+    async def parts() -> AsyncIterator[bytes]:
+        for start in range(0, len(original), config.S3_MULTIPART_PART_SIZE):
+            yield original[start:start + config.S3_MULTIPART_PART_SIZE]
+
+    await asyncio.gather(
+        s3_client.upload_stream(chunks=parts(), object_name=file_name, content_type=content_type),
+        *(
+            s3_client.upload_bytes(data=data, object_name=keys[name], content_type=rendition_type)
+            for name, (data, rendition_type) in renditions.items()
+        )
+    )
+    return keys
+
+
+def object_names(asset: models.CardAsset) -> list[str]:
+    """
+    Get every S3 object stored for an asset.
+
+    Args:
+        asset: Avatar or icon asset
+
+    Returns:
+        list[str]: Original and rendition keys
+    """
+    return [asset.file_name, *(asset.renditions or {}).values()]
+
+
+def asset_keys(asset: models.CardAsset) -> list[str]:
+    """
+    Get S3 keys that have to be presigned for an asset.
+
+    Args:
+        asset: Avatar or icon asset
+
+    Returns:
+        list[str]: Rendition keys, or the original for assets without renditions
+    """
+    if asset.renditions:
+        return list(asset.renditions.values())
+    return [asset.file_name]
+
+
+def asset_links(
+    asset: models.CardAsset,
+    urls: dict[str, str]
+) -> tuple[str | None, dict[str, str] | None]:
+    """
+    Resolve asset links from presigned URLs.
+
+    The main link points at the JPEG fallback when renditions exist, so
+    clients that ignore renditions stop downloading the original.
+
+    Args:
+        asset: Avatar or icon asset
+        urls: Presigned URLs by S3 key
+
+    Returns:
+        tuple[str | None, dict[str, str] | None]: Main link and rendition links
+    """
+    if not asset.renditions:
+        return urls.get(asset.file_name), None
+
+    rendition_links: dict[str, str] = {
+        name: urls[key] for name, key in asset.renditions.items() if key in urls
+    }
+    fallback: str | None = next(
+        (link for name, link in rendition_links.items() if name.startswith("jpeg_")),
+        None
+    )
+    return fallback, rendition_links
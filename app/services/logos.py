@@ -3,13 +3,17 @@ Social link icon service.
 
 Contains business logic for getting and uploading icons.
 """
-from fastapi import UploadFile
+from concurrent.futures import Executor
+from typing import AsyncIterator
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import repo, schemas
 from app.core import enums, models
 from app.core.config import config
+from app.core.redis import RedisManager
 from app.s3.client import S3Client
+from app.services import card_cache, images
 
 
 async def get_all(
@@ -32,11 +36,10 @@ async def get_all(
     asset_names: dict[int, str] = await repo.logos.get_all(card_id=card_id, session=session)
     if not asset_names:
         return {}
+    urls: dict[str, str] = await s3_client.get_object_urls(list(asset_names.values()))
     asset_urls: dict[int, str] = {
-        asset_id: await s3_client.get_object_url(
-            asset_names.get(asset_id)
-        )
-        for asset_id in asset_names.keys()
+        asset_id: urls[file_name]
+        for asset_id, file_name in asset_names.items()
     }
     
     return asset_urls
@@ -47,17 +50,26 @@ async def get_all(
 async def upload(
     social: models.CardSocial, 
     s3_client: S3Client, 
-    file: UploadFile, 
-    session: AsyncSession
+    content_type: str,
+    chunks: AsyncIterator[bytes],
+    image_pool: Executor,
+    session: AsyncSession,
+    redis_manager: RedisManager
 ) -> schemas.assets.Out:
     """
     Upload icon for social link.
     
+    The file and its renditions are stored in S3 first, so an aborted
+    upload never leaves a database row pointing at a missing object.
+    
     Args:
         social: Validated social link object
         s3_client: S3 client for upload
-        file: Image file
+        content_type: Validated image MIME type
+        chunks: Validated image body chunks
+        image_pool: Process pool for rendering renditions
         session: Database session
+        redis_manager: Redis manager for cache invalidation
         
     Returns:
         schemas.assets.Out: Uploaded asset info
@@ -66,15 +78,21 @@ async def upload(
         card_id=social.card_id,
         social_id=social.id
     )
+    renditions: dict[str, str] = await images.store(
+        file_name=file_name,
+        content_type=content_type,
+        chunks=chunks,
+        s3_client=s3_client,
+        image_pool=image_pool
+    )
     asset: models.CardAsset = await repo.logos.create(
         card_id=social.card_id, 
         social_id=social.id,
         file_name=file_name, 
+        renditions=renditions,
         session=session
     )
-    await s3_client.upload_file(
-        file_obj=file,
-        object_name=file_name
-    )
+    await session.commit()
+    await card_cache.invalidate(card_id=social.card_id, redis_manager=redis_manager)
     
     return schemas.assets.Out.model_validate(asset, from_attributes=True)
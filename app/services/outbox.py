@@ -0,0 +1,93 @@
+"""
+S3 outbox service.
+
+Drains S3 deletions recorded by repo.outbox.add in batches, so API requests
+never wait on object storage.
+"""
+import asyncio
+
+from app import repo
+from app.core import models
+from app.core.config import config
+from app.core.logger import get_logger
+from app.core.manager import AsyncDatabaseManager
+from app.s3.client import S3Client
+
+logger = get_logger(__name__)
+
+
+async def drain(
+    db_manager: AsyncDatabaseManager,
+    s3_client: S3Client
+) -> int:
+    """
+    Process one batch of pending deletions.
+    
+    Successful rows are removed, failed ones are retried with backoff.
+    
+    Args:
+        db_manager: Database manager
+        s3_client: S3 client
+        
+    Returns:
+        int: Number of claimed rows
+    """
+    async with db_manager.async_session_maker() as session:
+        rows: list[models.S3Outbox] = await repo.outbox.claim(
+            limit=config.OUTBOX_BATCH_SIZE,
+            session=session
+        )
+        if not rows:
+            return 0
+
+        try:
+            errors: dict[str, str] = await s3_client.delete_assets(
+                list({row.object_name for row in rows})
+            )
+        except Exception as e:
+            errors = {row.object_name: str(e) for row in rows}
+
+        failed: list[models.S3Outbox] = [row for row in rows if row.object_name in errors]
+        done: list[int] = [row.id for row in rows if row.object_name not in errors]
+        if done:
+            await repo.outbox.remove(ids=done, session=session)
+        if failed:
+            await repo.outbox.reschedule(
+                errors={row.id: errors[row.object_name] for row in failed},
+                base_delay=config.OUTBOX_RETRY_DELAY,
+                max_delay=config.OUTBOX_MAX_RETRY_DELAY,
+                session=session
+            )
+        await session.commit()
+
+    if failed:
+        logger.warning("S3 outbox: %s deletions failed, will retry", len(failed))
+    return len(rows)
+
+
+async def run(
+    db_manager: AsyncDatabaseManager,
+    s3_client: S3Client,
+    stop: asyncio.Event
+) -> None:
+    """
+    Drain the outbox until stop is set.
+    
+    Args:
+        db_manager: Database manager
+        s3_client: S3 client
+        stop: Event that ends the loop
+    """
+    while not stop.is_set():
+        try:
+            claimed: int = await drain(db_manager=db_manager, s3_client=s3_client)
+        except Exception as e:
+            logger.error("S3 outbox drain failed: %s", e)
+            claimed = 0
+        # a full batch means more is waiting, keep going without sleeping
+        if claimed >= config.OUTBOX_BATCH_SIZE:
+            continue
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=config.OUTBOX_POLL_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
@@ -7,48 +7,56 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import repo, schemas
 from app.core import models
-from app.core.config import config
-from app.s3.client import S3Client
+from app.core.redis import RedisManager
+from app.services import card_cache, images
 
 
 async def create(
-    card: models.Card, 
+    card_id: int, 
     social: schemas.socials.In, 
-    session: AsyncSession
+    session: AsyncSession,
+    redis_manager: RedisManager
 ) -> schemas.socials.Out:
     """
     Create social link for card.
     
     Args:
-        card: Validated card object
+        card_id: Validated card ID
         social: Social link data
         session: Database session
+        redis_manager: Redis manager for cache invalidation
         
     Returns:
         schemas.socials.Out: Created social link
     """
-    card_social: models.socials.Out = await repo.socials.create(card=card, social=social, session=session)
+    card_social: models.CardSocial = await repo.socials.create(card_id=card_id, social=social, session=session)
+    await session.commit()
+    await card_cache.invalidate(card_id=card_id, redis_manager=redis_manager)
     
     return schemas.socials.Out.model_validate(card_social, from_attributes=True)
 
 
 async def delete(
     social: models.CardSocial, 
-    card: models.Card, 
     session: AsyncSession, 
-    s3_client: S3Client
+    redis_manager: RedisManager
 ) -> None:
     """
     Delete social link and associated icon.
     
+    Icon objects are queued in the outbox together with the icon row and
+    removed from S3 by the outbox worker.
+    
     Args:
         social: Validated social link object
-        card: Card object
         session: Database session
-        s3_client: S3 client for deleting icon
+        redis_manager: Redis manager for cache invalidation
     """
-    await repo.socials.delete(card=card, social_id=social.id, session=session)
-    
     if social.icon_asset_id:
-        file_name: str = config.S3_ICON_TEMPLATE.format(card_id=card.id, social_id=social.id)
-        await s3_client.delete_asset(file_name=file_name)
\ No newline at end of file
+        icon: models.CardAsset | None = await repo.logos.delete(asset_id=social.icon_asset_id, session=session)
+        if icon:
+            await repo.outbox.add(object_names=images.object_names(icon), session=session)
+
+    await repo.socials.delete(card_id=social.card_id, social_id=social.id, session=session)
+    await session.commit()
+    await card_cache.invalidate(card_id=social.card_id, redis_manager=redis_manager)
\ No newline at end of file
@@ -1 +1 @@
-from . import code, token, utils
\ No newline at end of file
+from . import code, conditional, export, images, multipart, profiler, token, utils
\ No newline at end of file
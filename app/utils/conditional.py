@@ -0,0 +1,64 @@
+"""
+Conditional GET helpers (ETag / Last-Modified).
+
+A card representation changes when the card is written (updated_at is bumped
+for socials and assets too) and when its presigned URLs are re-signed, so the
+validators combine updated_at with the current CARD_CACHE_TTL window. The
+window has to stay: with a version-only validator every 304 would extend the
+life of a stored body whose presigned URLs have already expired.
+
+The ETag is weak. Within one window the body is equivalent but not always
+byte-identical, since a cache miss can re-sign URLs, and a strong ETag would
+promise more than that.
+"""
+import hashlib
+import time
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request
+
+from app.core.config import config
+
+
+def build(card_id: int, updated_at: datetime) -> tuple[str, datetime]:
+    window: int = int(time.time()) // config.CARD_CACHE_TTL
+    digest: str = hashlib.sha256(
+        f"{card_id}:{updated_at.isoformat()}:{window}".encode()
+    ).hexdigest()[:32]
+
+    window_start = datetime.fromtimestamp(window * config.CARD_CACHE_TTL, tz=timezone.utc)
+    last_modified = max(updated_at.replace(tzinfo=timezone.utc), window_start)
+    return f'W/"{digest}"', last_modified.replace(microsecond=0)
+
+
+def headers(etag: str, last_modified: datetime) -> dict[str, str]:
+    return {
+        "ETag": etag,
+        "Last-Modified": format_datetime(last_modified, usegmt=True),
+        # clients may keep the body but must revalidate before reuse
+        "Cache-Control": "no-cache",
+    }
+
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime) -> bool:
+    if_none_match: str | None = request.headers.get("If-None-Match")
+    if if_none_match is not None:
+        # weak comparison, as RFC 9110 requires for If-None-Match
+        tags: list[str] = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or etag.removeprefix("W/") in tags
+
+    if_modified_since: str | None = request.headers.get("If-Modified-Since")
+    if if_modified_since is None:
+        return False
+    try:
+        since: datetime = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified <= since
+
+
+def has_validators(request: Request) -> bool:
+    return "If-None-Match" in request.headers or "If-Modified-Since" in request.headers
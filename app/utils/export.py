@@ -0,0 +1,40 @@
+"""
+Streaming export formats.
+
+Rows are serialized one at a time so large exports are never built as a
+single string.
+"""
+import csv
+import io
+import json
+from typing import Iterable, Iterator
+
+MEDIA_TYPES: dict[str, str] = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def to_csv(fieldnames: list[str], rows: Iterable[dict]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+        # flush every few KB instead of once per row
+        if buffer.tell() >= 8192:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def to_ndjson(rows: Iterable[dict]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(row, separators=(",", ":")) + "\n"
+
+
+def serialize(fmt: str, fieldnames: list[str], rows: Iterable[dict]) -> Iterator[str]:
+    if fmt == "csv":
+        return to_csv(fieldnames, rows)
+    return to_ndjson(rows)
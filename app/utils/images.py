@@ -0,0 +1,75 @@
+"""
+Image renditions.
+
+render() is CPU bound and is meant to run in the image process pool.
+"""
+import io
+import os
+
+from PIL import Image, ImageOps
+
+# refuse decompression bombs long before Pillow's own 89M pixel warning
+MAX_PIXELS: int = 40_000_000
+
+WEBP_QUALITY: int = 80
+JPEG_QUALITY: int = 85
+
+
+def rendition_key(object_name: str, name: str) -> str:
+    # avatar-1.png + webp_256 -> avatar-1-256.webp
+    base, _ = os.path.splitext(object_name)
+    fmt, size = name.split("_")
+    extension: str = "jpg" if fmt == "jpeg" else fmt
+    return f"{base}-{size}.{extension}"
+
+
+def render(data: bytes, sizes: list[int]) -> dict[str, tuple[bytes, str]]:
+    """
+    Decode image and encode it into fixed renditions.
+
+    Produces a WebP for every size and a JPEG fallback at the largest one.
+    Re-encoding drops EXIF and every other metadata block.
+
+    Args:
+        data: Original image bytes
+        sizes: Longest-side sizes in pixels
+
+    Returns:
+        dict[str, tuple[bytes, str]]: Rendition name to encoded bytes and MIME type
+
+    Raises:
+        ValueError: If image cannot be decoded or is too large
+    """
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            if image.width * image.height > MAX_PIXELS:
+                raise ValueError("Image dimensions are too large")
+            image = ImageOps.exif_transpose(image)
+            image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+    except (OSError, Image.DecompressionBombError) as e:
+        raise ValueError("Cannot decode image") from e
+
+    renditions: dict[str, tuple[bytes, str]] = {}
+    for size in sorted(sizes):
+        resized: Image.Image = image.copy()
+        resized.thumbnail((size, size), Image.Resampling.LANCZOS)
+        renditions[f"webp_{size}"] = (encode(resized, "WEBP", quality=WEBP_QUALITY), "image/webp")
+
+    largest: int = max(sizes)
+    fallback: Image.Image = image.copy()
+    fallback.thumbnail((largest, largest), Image.Resampling.LANCZOS)
+    if fallback.mode == "RGBA":
+        background: Image.Image = Image.new("RGB", fallback.size, (255, 255, 255))
+        background.paste(fallback, mask=fallback.getchannel("A"))
+        fallback = background
+    renditions[f"jpeg_{largest}"] = (
+        encode(fallback, "JPEG", quality=JPEG_QUALITY, optimize=True, progressive=True),
+        "image/jpeg"
+    )
+    return renditions
+
+
+def encode(image: Image.Image, fmt: str, **options) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format=fmt, **options)
+    return buffer.getvalue()
@@ -0,0 +1,151 @@
+"""
+Streaming multipart/form-data reader.
+
+Parses the request body as it arrives instead of letting Starlette spool
+the whole upload first. Parts are consumed strictly in order.
+"""
+from collections import deque
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+from fastapi import HTTPException, Request, status
+from python_multipart.exceptions import MultipartParseError
+from python_multipart.multipart import MultipartParser, parse_options_header
+
+
+@dataclass
+class Part:
+    name: str
+    filename: str | None
+    content_type: str | None
+
+
+class MultipartStream:
+    def __init__(self, request: Request, max_field_size: int = 1024):
+        content_type, options = parse_options_header(request.headers.get("Content-Type"))
+        boundary: bytes | None = options.get(b"boundary")
+        if content_type != b"multipart/form-data" or not boundary:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Expected multipart/form-data body"
+            )
+
+        self.max_field_size: int = max_field_size
+        self._body: AsyncIterator[bytes] = request.stream()
+        self._events: deque[tuple[str, object]] = deque()
+        self._headers: dict[str, str] = {}
+        self._header_field: bytes = b""
+        self._header_value: bytes = b""
+        self._finished: bool = False
+        self._in_part: bool = False
+        self._parser: MultipartParser = MultipartParser(boundary, callbacks={
+            "on_part_begin": self._on_part_begin,
+            "on_part_data": self._on_part_data,
+            "on_part_end": lambda: self._events.append(("end", None)),
+            "on_header_field": self._on_header_field,
+            "on_header_value": self._on_header_value,
+            "on_header_end": self._on_header_end,
+            "on_headers_finished": self._on_headers_finished,
+        })
+
+    async def next_part(self) -> Part | None:
+        """Skip the rest of the current part and return the next one."""
+        while True:
+            event = await self._next_event()
+            if event is None:
+                return None
+            kind, payload = event
+            if kind == "part":
+                self._in_part = True
+                return payload
+            if kind == "end":
+                self._in_part = False
+
+    async def read_fields_until(self, name: str) -> dict[str, str]:
+        """Read text fields up to the part called name and stop there."""
+        fields: dict[str, str] = {}
+        while True:
+            part: Part | None = await self.next_part()
+            if part is None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Missing '{name}' part"
+                )
+            if part.name == name:
+                return fields
+            if part.filename is None:
+                fields[part.name] = await self.read_field()
+
+    async def read_field(self) -> str:
+        """Read the current part as a short text field."""
+        value: bytearray = bytearray()
+        async for chunk in self.iter_part():
+            value.extend(chunk)
+            if len(value) > self.max_field_size:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Form field too large"
+                )
+        return value.decode()
+
+    async def iter_part(self) -> AsyncIterator[bytes]:
+        """Yield the body of the current part chunk by chunk."""
+        while self._in_part:
+            event = await self._next_event()
+            if event is None:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Unexpected end of multipart body"
+                )
+            kind, payload = event
+            if kind == "data":
+                yield payload
+            elif kind == "end":
+                self._in_part = False
+
+    async def _next_event(self) -> tuple[str, object] | None:
+        while not self._events:
+            if self._finished:
+                return None
+            try:
+                chunk: bytes = await self._body.__anext__()
+            except StopAsyncIteration:
+                self._parser.finalize()
+                self._finished = True
+                continue
+            if not chunk:
+                continue
+            try:
+                self._parser.write(chunk)
+            except MultipartParseError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Malformed multipart body"
+                )
+        return self._events.popleft()
+
+    def _on_part_begin(self) -> None:
+        self._headers = {}
+
+    def _on_part_data(self, data: bytes, start: int, end: int) -> None:
+        self._events.append(("data", data[start:end]))
+
+    def _on_header_field(self, data: bytes, start: int, end: int) -> None:
+        self._header_field += data[start:end]
+
+    def _on_header_value(self, data: bytes, start: int, end: int) -> None:
+        self._header_value += data[start:end]
+
+    def _on_header_end(self) -> None:
+        self._headers[self._header_field.decode().lower()] = self._header_value.decode()
+        self._header_field = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self) -> None:
+        _, options = parse_options_header(self._headers.get("content-disposition"))
+        filename: bytes | None = options.get(b"filename")
+        self._events.append(("part", Part(
+            name=options.get(b"name", b"").decode(),
+            filename=filename.decode() if filename is not None else None,
+            content_type=self._headers.get("content-type"),
+        )))
@@ -0,0 +1,161 @@
+"""
+Sampling profiler for individual requests.
+
+One background thread, alive only while a request is being profiled,
+samples the event loop thread every PROFILE_INTERVAL seconds. A sample is
+attributed to a request when the request's frame is on the running stack;
+otherwise the request's suspended coroutine stack is recorded with an
+[await] leaf, so time spent waiting on Postgres, Redis or S3 shows up too.
+
+Profiles are written in the folded (collapsed) stack format read by
+flamegraph.pl and speedscope, one file per profile in PROFILE_DIR.
+"""
+import asyncio
+import os
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from types import FrameType
+
+from app.core.config import config
+
+
+class Profile:
+    # folded stacks of one request, or of every request in a window
+    def __init__(self, requests: int = 1, path_prefix: str | None = None):
+        self.id: str = f"{int(time.time())}-{os.getpid()}-{secrets.token_hex(4)}"
+        self.remaining: int = requests
+        self.path_prefix: str | None = path_prefix
+        self.stacks: Counter[str] = Counter()
+        self._lock: threading.Lock = threading.Lock()
+
+    def add(self, root: str, samples: Counter[tuple[str, ...]]) -> None:
+        with self._lock:
+            for stack, count in samples.items():
+                self.stacks[";".join((root, *stack))] += count
+
+    def folded(self) -> str:
+        with self._lock:
+            return "".join(f"{stack} {count}\n" for stack, count in self.stacks.items())
+
+    def save(self) -> None:
+        os.makedirs(config.PROFILE_DIR, exist_ok=True)
+        path: str = profile_path(self.id)
+        # window requests finishing together save concurrently
+        temp: str = f"{path}.{threading.get_ident()}.tmp"
+        with open(temp, "w") as file:
+            file.write(self.folded())
+        os.replace(temp, path)
+
+
+class Target:
+    # one profiled request: its outermost frame and the task running it
+    def __init__(self, frame: FrameType, task: asyncio.Task, thread_id: int):
+        self.frame: FrameType = frame
+        self.task: asyncio.Task = task
+        self.thread_id: int = thread_id
+        self.samples: Counter[tuple[str, ...]] = Counter()
+
+
+class Sampler:
+    def __init__(self, interval: float):
+        self.interval: float = interval
+        self._targets: set[Target] = set()
+        self._lock: threading.Lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def start(self, frame: FrameType) -> Target:
+        target = Target(frame, asyncio.current_task(), threading.get_ident())
+        with self._lock:
+            self._targets.add(target)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+                self._thread.start()
+        return target
+
+    def stop(self, target: Target) -> Counter[tuple[str, ...]]:
+        with self._lock:
+            self._targets.discard(target)
+        return target.samples
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._targets:
+                    # cleared under the lock, so start() spawns a new thread
+                    self._thread = None
+                    return
+                targets: list[Target] = list(self._targets)
+            frames: dict[int, FrameType] = sys._current_frames()
+            stacks: list[tuple[Target, tuple[str, ...] | None]] = [
+                (target, sample(target, frames.get(target.thread_id))) for target in targets
+            ]
+            # recorded under the lock and only for targets still running:
+            # once stop() returns, the request owns its samples alone
+            with self._lock:
+                for target, stack in stacks:
+                    if stack and target in self._targets:
+                        target.samples[stack] += 1
+
+
+def sample(target: Target, frame: FrameType | None) -> tuple[str, ...] | None:
+    running: list[FrameType] = []
+    while frame is not None:
+        running.append(frame)
+        if frame is target.frame:
+            return tuple(label(f) for f in reversed(running[:-1]))
+        frame = frame.f_back
+
+    # not on the CPU: walk the suspended coroutine chain instead
+    suspended: list[FrameType] = awaited_frames(target.task.get_coro())
+    for i, frame in enumerate(suspended):
+        if frame is target.frame:
+            return (*(label(f) for f in suspended[i + 1:]), "[await]")
+    return None
+
+
+def awaited_frames(coro) -> list[FrameType]:
+    # Task.get_stack() stops at the outermost coroutine, follow cr_await down
+    frames: list[FrameType] = []
+    while coro is not None:
+        frame: FrameType | None = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is None:
+            break
+        frames.append(frame)
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return frames
+
+
+def label(frame: FrameType) -> str:
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_qualname}"
+
+
+def profile_path(profile_id: str) -> str:
+    return os.path.join(config.PROFILE_DIR, f"{profile_id}.folded")
+
+
+sampler: Sampler = Sampler(config.PROFILE_INTERVAL)
+
+# window armed by an admin on this worker, None when off
+window: Profile | None = None
+
+
+def arm(requests: int, path_prefix: str | None = None) -> Profile:
+    global window
+    window = Profile(requests=requests, path_prefix=path_prefix)
+    return window
+
+
+def claim(path: str) -> Profile | None:
+    # takes one request slot of the armed window
+    global window
+    profile: Profile | None = window
+    if profile is None or (profile.path_prefix and not path.startswith(profile.path_prefix)):
+        return None
+    profile.remaining -= 1
+    if profile.remaining <= 0:
+        window = None
+    return profile
@@ -1,23 +1,115 @@
-from app.core.config import config
+import hashlib
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
+
 from jose import jwt
 
+from app.core.config import config
+
+
+class VerifiedTokenCache:
+    # LRU of decoded payloads keyed by token hash; an entry is served only
+    # until the token's own exp, so expiry is still enforced
+    def __init__(self, max_size: int):
+        self.max_size: int = max_size
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self._entries: OrderedDict[bytes, tuple[dict, float]] = OrderedDict()
+        # sync dependencies run in the threadpool
+        self._lock: threading.Lock = threading.Lock()
+
+    def get(self, key: bytes) -> dict | None:
+        with self._lock:
+            entry: tuple[dict, float] | None = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            payload, expires_at = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return payload
+
+    def peek(self, key: bytes) -> dict | None:
+        # lookup that leaves LRU order and hit/miss counters alone
+        with self._lock:
+            entry: tuple[dict, float] | None = self._entries.get(key)
+        if entry is None or entry[1] <= time.time():
+            return None
+        return entry[0]
+
+    def put(self, key: bytes, payload: dict) -> None:
+        expires_at = payload.get("exp")
+        if not isinstance(expires_at, (int, float)):
+            return
+        with self._lock:
+            self._entries[key] = (payload, float(expires_at))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+cache: VerifiedTokenCache = VerifiedTokenCache(config.TOKEN_CACHE_SIZE)
+
+
 def create(card_id: int) -> str:
     expire = datetime.utcnow() + timedelta(minutes=config.JWT_EXPIRE_MINUTES)
-    
+
     payload = {
         "card_id": card_id,
         "exp": expire,
         "type": "edit_access"
     }
-    
+
     token = jwt.encode(payload, config.JWT_SECRET, algorithm=config.JWT_ALGORITHM)
     return token
 
 
-def verify(token: str) -> dict | None:
-    try:
+def verify(token: str) -> dict:
+    """
+    Decode token, verifying its signature once per token per worker.
+
+    Raises:
+        jwt.JWTError: If token is invalid or expired
+    """
+    key: bytes = cache_key(token)
+    payload: dict | None = cache.get(key)
+    if payload is None:
         payload = jwt.decode(token, config.JWT_SECRET, algorithms=[config.JWT_ALGORITHM])
-        return payload
-    except jwt.JWTError:
-        return None
\ No newline at end of file
+        cache.put(key, payload)
+    return dict(payload)
+
+
+def get_verified(token: str) -> dict | None:
+    """
+    Get payload of a token this worker has already verified, without decoding.
+
+    Returns:
+        dict | None: Payload, or None if the token is not cached
+    """
+    payload: dict | None = cache.peek(cache_key(token))
+    return dict(payload) if payload is not None else None
+
+
+def cache_key(token: str) -> bytes:
+    return hashlib.sha256(token.encode()).digest()
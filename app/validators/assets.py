@@ -3,7 +3,9 @@ Asset validators (images).
 
 Check file size and type for uploads.
 """
-from fastapi import HTTPException, UploadFile, status
+from typing import AsyncIterator
+
+from fastapi import HTTPException, Request, UploadFile, status
 
 from app.core import config
 
@@ -36,3 +38,95 @@ def validate_image(
             detail=f"Not allowed file type, allowed types: {', '.join(allowed_types)}"
         )
 
+
+# leading bytes of every supported image format
+IMAGE_SIGNATURES: dict[bytes, str] = {
+    b"\xff\xd8\xff": "image/jpeg",
+    b"\x89PNG\r\n\x1a\n": "image/png",
+}
+
+# room for multipart boundaries, part headers and form fields
+MULTIPART_OVERHEAD: int = 16 * 1024
+
+
+def validate_content_length(
+    request: Request,
+    max_size: int = config.IMAGE_MAX_SIZE
+) -> None:
+    """
+    Reject uploads whose declared body size is already too large.
+    
+    Args:
+        request: HTTP request
+        max_size: Maximum file size in bytes (default from config)
+        
+    Raises:
+        HTTPException: 413 if Content-Length exceeds the limit
+    """
+    content_length: str | None = request.headers.get("Content-Length")
+    if content_length and content_length.isdigit() and int(content_length) > max_size + MULTIPART_OVERHEAD:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="Too large file, it must be less than 5MB"
+        )
+
+
+async def require_image_stream(
+    chunks: AsyncIterator[bytes],
+    max_size: int = config.IMAGE_MAX_SIZE,
+    allowed_types: list[str] = config.ALLOWED_IMAGE_TYPES
+) -> tuple[str, AsyncIterator[bytes]]:
+    """
+    Validate streamed image by magic bytes and size while it arrives.
+    
+    Reads just enough of the stream to detect the type. Size is enforced
+    on the returned iterator, so an oversized file fails as soon as the
+    limit is crossed instead of after the whole body was received.
+    
+    Args:
+        chunks: File body chunks
+        max_size: Maximum size in bytes (default from config)
+        allowed_types: Allowed MIME types (default from config)
+        
+    Returns:
+        tuple[str, AsyncIterator[bytes]]: Detected MIME type and file chunks
+        
+    Raises:
+        HTTPException: 400 if file type not allowed
+        HTTPException: 413 if file too large (raised while iterating)
+    """
+    head: bytes = b""
+    signature_len: int = max(len(signature) for signature in IMAGE_SIGNATURES)
+    async for chunk in chunks:
+        head += chunk
+        if len(head) >= signature_len:
+            break
+
+    content_type: str | None = next(
+        (mime for signature, mime in IMAGE_SIGNATURES.items() if head.startswith(signature)),
+        None
+    )
+    if content_type not in allowed_types:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Not allowed file type, allowed types: {', '.join(allowed_types)}"
+        )
+
+    async def limited() -> AsyncIterator[bytes]:
+        size: int = len(head)
+        if size > max_size:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail="Too large file, it must be less than 5MB"
+            )
+        yield head
+        async for chunk in chunks:
+            size += len(chunk)
+            if size > max_size:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail="Too large file, it must be less than 5MB"
+                )
+            yield chunk
+
+    return content_type, limited()
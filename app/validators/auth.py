@@ -30,14 +30,17 @@ def require_access_token(request: Request) -> dict:
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Not authenticated"
         )
+    scheme, _, credentials = token.partition(" ")
     try:
-        payload = utils.token.verify(token.split(" ")[1])
-        return payload
+        payload: dict = utils.token.verify(credentials)
     except jose.JWTError:
+        payload = {}
+    if scheme != "Bearer" or "card_id" not in payload:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Invalid token"
         )
+    return payload
 
 
 def require_admin_token(request: Request) -> dict:
@@ -3,16 +3,21 @@ Card validators.
 
 Check card existence and return it or raise HTTPException.
 """
+from datetime import datetime
+
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app import repo
+from app import repo, schemas
 from app.core import models
+from app.core.config import config
 
 
 async def require_card(card_id: int, session: AsyncSession) -> models.Card:
     """
-    Verify card existence.
+    Verify card existence and load its columns.
+    
+    Socials and assets are not loaded.
     
     Args:
         card_id: Card ID to check
@@ -31,3 +36,100 @@ async def require_card(card_id: int, session: AsyncSession) -> models.Card:
             detail=f"Card with id {card_id} not found"
         )
     return card
+
+
+async def require_card_exists(card_id: int, session: AsyncSession) -> int:
+    """
+    Verify card existence without loading it.
+    
+    Args:
+        card_id: Card ID to check
+        session: Database session
+        
+    Returns:
+        int: Card ID
+        
+    Raises:
+        HTTPException: 404 if card not found
+    """
+    if not await repo.cards.exists_by_id(card_id=card_id, session=session):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Card with id {card_id} not found"
+        )
+    return card_id
+
+
+async def require_card_version(card_id: int, session: AsyncSession) -> datetime:
+    """
+    Verify card existence and return its version.
+    
+    Args:
+        card_id: Card ID to check
+        session: Database session
+        
+    Returns:
+        datetime: Card updated_at
+        
+    Raises:
+        HTTPException: 404 if card not found
+    """
+    updated_at: datetime | None = await repo.cards.get_updated_at(card_id=card_id, session=session)
+    if not updated_at:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Card with id {card_id} not found"
+        )
+    return updated_at
+
+
+async def require_full_card(card_id: int, session: AsyncSession) -> models.Card:
+    """
+    Verify card existence and load its socials and assets.
+    
+    Args:
+        card_id: Card ID to check
+        session: Database session
+        
+    Returns:
+        models.Card: Found card with socials and assets loaded
+        
+    Raises:
+        HTTPException: 404 if card not found
+    """
+    card: models.Card | None = await repo.cards.get_full(card_id=card_id, session=session)
+    if not card:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Card with id {card_id} not found"
+        )
+    return card
+
+
+
+async def require_bulk_targets(bulk: schemas.cards.BulkActionIn, session: AsyncSession) -> list[int]:
+    """
+    Resolve existing target cards of a bulk action.
+    
+    Args:
+        bulk: Bulk action with card IDs or filter
+        session: Database session
+        
+    Returns:
+        list[int]: IDs of existing target cards
+        
+    Raises:
+        HTTPException: 400 if filter matches more than BULK_MAX_CARDS cards
+    """
+    card_ids: list[int] = await repo.cards.get_ids(
+        card_ids=list(set(bulk.card_ids)) if bulk.card_ids is not None else None,
+        filters=bulk.filter,
+        limit=config.BULK_MAX_CARDS + 1,
+        session=session
+    )
+    if len(card_ids) > config.BULK_MAX_CARDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Filter matches more than {config.BULK_MAX_CARDS} cards"
+        )
+    return card_ids
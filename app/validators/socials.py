@@ -18,6 +18,10 @@ async def require_social(
     """
     Verify social link existence and ownership.
     
+    The card_id predicate is the ownership check: a matching row proves
+    the social link exists and belongs to an existing card, so the card
+    itself does not have to be loaded.
+    
     Args:
         card_id: Owner card ID
         social_id: Social link ID
@@ -0,0 +1,159 @@
+"""
+EXPLAIN plans and timings for the hot queries.
+
+Seeds a synthetic dataset (one million cards by default) into the database
+from app.core.config, then runs EXPLAIN (ANALYZE, BUFFERS) and a timing
+loop for every query the API runs per request. Point it at a scratch
+database migrated with python -m app.migrate, never at production:
+
+    python -m bench.explain_hot_queries --seed --cards 1000000
+    python -m bench.explain_hot_queries --runs 2000 --json bench_output.json
+
+Comparing index sets: run it at revision 0002 and again at 0003.
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import config
+
+SEED_STATEMENTS: list[tuple[str, str]] = [
+    ("cards", """
+    INSERT INTO cards (name, title, description, phone, email, website, city, is_active, created_at, updated_at)
+    SELECT 'Card ' || g, 'Engineer', 'Synthetic benchmark card', '7' || lpad(g::text, 10, '0'),
+           'card' || g || '@example.com', NULL, (ARRAY['Almaty', 'Astana', 'Shymkent'])[1 + g % 3],
+           g % 10 <> 0, now() - (g || ' seconds')::interval, now()
+    FROM generate_series(1, :cards) AS g
+    """),
+    # one active and one deactivated code per card
+    ("codes", """
+    INSERT INTO codes (card_id, code_hash, is_active, created_at)
+    SELECT id, encode(sha256(('active-' || id)::bytea), 'hex'), true, now() FROM cards
+    UNION ALL
+    SELECT id, encode(sha256(('old-' || id)::bytea), 'hex'), false, now() FROM cards
+    """),
+    ("card_socials", """
+    INSERT INTO card_socials (card_id, type, url, label, order_id, is_visible, created_at)
+    SELECT id, 'telegram', 'https://t.me/card' || id, 'Telegram', n, true, now()
+    FROM cards, generate_series(0, 2) AS n
+    """),
+    ("card_assets", """
+    INSERT INTO card_assets (card_id, type, file_name, created_at)
+    SELECT id, 'avatar', 'bench/avatar-' || id || '.png', now() FROM cards WHERE id % 2 = 0
+    UNION ALL
+    SELECT id, 'app_icon', 'bench/icon-' || id || '.png', now() FROM cards WHERE id % 5 = 0
+    """),
+    ("analyze", "ANALYZE"),
+]
+
+# same shape as the statements built in app/repo
+HOT_QUERIES: dict[str, str] = {
+    "redeem_code": "SELECT * FROM codes WHERE is_active = true AND code_hash = :code_hash",
+    "get_avatar": "SELECT * FROM card_assets WHERE card_id = :card_id AND type = 'avatar'",
+    "get_icons": "SELECT * FROM card_assets WHERE card_id = :card_id AND type = 'app_icon'",
+    "get_full_card": """
+        SELECT * FROM cards
+        LEFT OUTER JOIN card_socials ON cards.id = card_socials.card_id
+        LEFT OUTER JOIN card_assets ON cards.id = card_assets.card_id
+        WHERE cards.id = :card_id
+        ORDER BY card_socials.order_id
+    """,
+    "get_social": "SELECT * FROM card_socials WHERE card_id = :card_id AND id = :social_id",
+    "next_social_order": "SELECT coalesce(max(order_id) + 1, 0) FROM card_socials WHERE card_id = :card_id",
+    "deactivate_codes": "SELECT id FROM codes WHERE card_id = :card_id AND is_active = true",
+    "admin_page": "SELECT * FROM cards WHERE id > :card_id ORDER BY id LIMIT 50",
+}
+
+
+async def seed(connection: AsyncConnection, cards: int) -> None:
+    existing: int = (await connection.execute(text("SELECT count(*) FROM cards"))).scalar_one()
+    if existing:
+        print(f"cards already has {existing} rows, skipping seed")
+        return
+    for name, statement in SEED_STATEMENTS:
+        started: float = time.perf_counter()
+        await connection.execute(text(statement), {"cards": cards})
+        await connection.commit()
+        print(f"seed {name}: {time.perf_counter() - started:.1f}s")
+
+
+async def sample_params(connection: AsyncConnection) -> dict:
+    max_id: int = (await connection.execute(text("SELECT max(id) FROM cards"))).scalar_one()
+    card_id: int = random.randint(1, max_id)
+    row = (await connection.execute(
+        text("SELECT id FROM card_socials WHERE card_id = :card_id LIMIT 1"), {"card_id": card_id}
+    )).first()
+    code_hash = (await connection.execute(
+        text("SELECT code_hash FROM codes WHERE card_id = :card_id AND is_active LIMIT 1"), {"card_id": card_id}
+    )).scalar_one_or_none()
+    return {"card_id": card_id, "social_id": row[0] if row else 0, "code_hash": code_hash or ""}
+
+
+async def explain(connection: AsyncConnection, query: str, params: dict) -> str:
+    result = await connection.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {query}"), params)
+    return "\n".join(row[0] for row in result)
+
+
+async def time_query(connection: AsyncConnection, query: str, runs: int) -> dict[str, float]:
+    max_id: int = (await connection.execute(text("SELECT max(id) FROM cards"))).scalar_one()
+    statement = text(query)
+    timings: list[float] = []
+    for _ in range(runs):
+        card_id: int = random.randint(1, max_id)
+        # random hashes: most redemption traffic is guessing
+        params = {
+            "card_id": card_id,
+            "social_id": card_id * 3,
+            "code_hash": f"{random.getrandbits(256):064x}",
+        }
+        started: float = time.perf_counter()
+        await connection.execute(statement, params)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {
+        "mean_ms": round(statistics.fmean(timings), 3),
+        "p50_ms": round(timings[len(timings) // 2], 3),
+        "p95_ms": round(timings[int(len(timings) * 0.95) - 1], 3),
+        "p99_ms": round(timings[int(len(timings) * 0.99) - 1], 3),
+    }
+
+
+async def main(cards: int, do_seed: bool, runs: int, output: str | None) -> None:
+    engine = create_async_engine(config.DATABASE_URL, poolclass=NullPool)
+    report: dict[str, dict] = {}
+    try:
+        async with engine.connect() as connection:
+            if do_seed:
+                await seed(connection, cards)
+            params: dict = await sample_params(connection)
+            for name, query in HOT_QUERIES.items():
+                plan: str = await explain(connection, query, params)
+                timing: dict[str, float] = await time_query(connection, query, runs)
+                await connection.rollback()
+                report[name] = {"plan": plan, **timing}
+                print(f"=== {name}  mean {timing['mean_ms']}ms  p95 {timing['p95_ms']}ms  p99 {timing['p99_ms']}ms")
+                print(plan)
+                print()
+    finally:
+        await engine.dispose()
+
+    if output:
+        with open(output, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="EXPLAIN and time the API's hot queries.")
+    parser.add_argument("--cards", type=int, default=1_000_000, help="cards to seed")
+    parser.add_argument("--seed", action="store_true", help="seed the dataset if cards is empty")
+    parser.add_argument("--runs", type=int, default=1000, help="timed executions per query")
+    parser.add_argument("--json", dest="output", help="write the report to this file")
+    args = parser.parse_args()
+    asyncio.run(main(cards=args.cards, do_seed=args.seed, runs=args.runs, output=args.output))
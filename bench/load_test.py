@@ -0,0 +1,405 @@
+"""
+End-to-end load test.
+
+Drives a running API, or one booted here from app.main:create_app, backed
+by the Postgres, Redis and MinIO services in docker-compose.load.yml.
+Settings come from load.env unless already set in the environment:
+
+    docker compose -f bench/docker-compose.load.yml up -d --wait
+    python -m bench.load_test --boot --seed --cards 10000 --avatars 200
+    python -m bench.load_test --boot --duration 120 --users 64 --json bench_output.json
+
+Seeding goes through the admin bulk API (cards and codes), SQL (socials)
+and the upload endpoint (avatars), and records card ids with their codes
+in --state, so later runs can skip it. The report has throughput and
+p50/p95/p99 latency per endpoint; compare two releases by running the
+same command against each.
+"""
+import argparse
+import asyncio
+import io
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+BENCH_DIR: Path = Path(__file__).resolve().parent
+ROOT_DIR: Path = BENCH_DIR.parent
+ENV_FILE: Path = BENCH_DIR / "load.env"
+
+# relative frequency of each user action
+MIX: dict[str, int] = {
+    "tap": 70,
+    "revalidate": 10,
+    "redeem": 5,
+    "edit": 8,
+    "social": 5,
+    "upload": 2,
+}
+# share of taps that go to the hottest fifth of the cards
+HOT_SHARE: float = 0.8
+
+
+def load_env(path: Path) -> dict[str, str]:
+    values: dict[str, str] = {}
+    for line in path.read_text().splitlines():
+        line = line.strip()
+        if line and not line.startswith("#") and "=" in line:
+            key, value = line.split("=", 1)
+            values[key.strip()] = value.strip()
+    return values
+
+
+@dataclass
+class Stats:
+    # latencies in seconds, per endpoint route template
+    latencies: dict[str, list[float]] = field(default_factory=dict)
+    statuses: dict[str, Counter] = field(default_factory=dict)
+    errors: Counter = field(default_factory=Counter)
+
+    def record(self, endpoint: str, seconds: float, status: int) -> None:
+        self.latencies.setdefault(endpoint, []).append(seconds)
+        self.statuses.setdefault(endpoint, Counter())[str(status)] += 1
+
+    def report(self, duration: float) -> dict:
+        endpoints: dict[str, dict] = {}
+        for endpoint, samples in sorted(self.latencies.items()):
+            samples = sorted(samples)
+            statuses: Counter = self.statuses[endpoint]
+            endpoints[endpoint] = {
+                "requests": len(samples),
+                "throughput_rps": round(len(samples) / duration, 2),
+                "errors": sum(count for status, count in statuses.items() if int(status) >= 500 or status == "0"),
+                "status": dict(statuses),
+                "p50_ms": percentile(samples, 0.50),
+                "p95_ms": percentile(samples, 0.95),
+                "p99_ms": percentile(samples, 0.99),
+                "max_ms": round(samples[-1] * 1000, 2),
+            }
+        total: int = sum(len(samples) for samples in self.latencies.values())
+        return {
+            "requests": total,
+            "throughput_rps": round(total / duration, 2),
+            "transport_errors": dict(self.errors),
+            "endpoints": endpoints,
+        }
+
+
+def percentile(sorted_samples: list[float], q: float) -> float:
+    index: int = min(len(sorted_samples) - 1, max(0, int(len(sorted_samples) * q + 0.5) - 1))
+    return round(sorted_samples[index] * 1000, 2)
+
+
+class Client:
+    # every request goes through here, so the template is what gets reported;
+    # nothing is recorded before measure_from (seeding, warmup)
+    def __init__(self, http: httpx.AsyncClient, stats: Stats):
+        self.http: httpx.AsyncClient = http
+        self.stats: Stats = stats
+        self.measure_from: float = math.inf
+
+    async def request(self, method: str, template: str, path: str, **kwargs) -> httpx.Response | None:
+        endpoint: str = f"{method} {template}"
+        started: float = time.perf_counter()
+        try:
+            response: httpx.Response = await self.http.request(method, path, **kwargs)
+        except httpx.HTTPError as e:
+            if time.monotonic() >= self.measure_from:
+                self.stats.record(endpoint, time.perf_counter() - started, 0)
+                self.stats.errors[type(e).__name__] += 1
+            return None
+        if time.monotonic() >= self.measure_from:
+            self.stats.record(endpoint, time.perf_counter() - started, response.status_code)
+        return response
+
+
+def sample_png(size: int = 512) -> bytes:
+    # noisy enough that PNG cannot compress it away, like a real photo
+    from PIL import Image
+
+    image = Image.frombytes("RGB", (size, size), os.urandom(size * size * 3))
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def auth(token: str) -> dict[str, str]:
+    return {"Cookie": f'Authorization="Bearer {token}"'}
+
+
+class Workload:
+    def __init__(self, client: Client, cards: list[tuple[int, str]], image: bytes):
+        self.client: Client = client
+        self.cards: list[tuple[int, str]] = cards
+        self.hot: list[tuple[int, str]] = cards[:max(1, len(cards) // 5)]
+        self.image: bytes = image
+        self.tokens: dict[int, str] = {}
+        self.etags: dict[int, str] = {}
+        self.actions: list[str] = list(MIX)
+        self.weights: list[int] = list(MIX.values())
+
+    def pick(self) -> tuple[int, str]:
+        return random.choice(self.hot if random.random() < HOT_SHARE else self.cards)
+
+    async def token(self, card_id: int, code: str) -> str | None:
+        if card_id not in self.tokens:
+            await self.redeem(card_id, code)
+        return self.tokens.get(card_id)
+
+    async def step(self) -> None:
+        action: str = random.choices(self.actions, self.weights)[0]
+        card_id, code = self.pick()
+        await getattr(self, action)(card_id, code)
+
+    async def tap(self, card_id: int, code: str) -> None:
+        response = await self.client.request("GET", "/v1/cards/{id}/", f"/v1/cards/{card_id}/")
+        if response is not None and "ETag" in response.headers:
+            self.etags[card_id] = response.headers["ETag"]
+
+    async def revalidate(self, card_id: int, code: str) -> None:
+        etag: str | None = self.etags.get(card_id)
+        if etag is None:
+            await self.tap(card_id, code)
+            return
+        await self.client.request(
+            "GET", "/v1/cards/{id}/ (conditional)", f"/v1/cards/{card_id}/", headers={"If-None-Match": etag}
+        )
+
+    async def redeem(self, card_id: int, code: str) -> None:
+        response = await self.client.request("POST", "/v1/codes/redeem/", "/v1/codes/redeem/", json={"code": code})
+        if response is not None and response.status_code == 200:
+            self.tokens[card_id] = response.json()["access_token"]
+
+    async def edit(self, card_id: int, code: str) -> None:
+        token: str | None = await self.token(card_id, code)
+        if token is None:
+            return
+        await self.client.request(
+            "PATCH", "/v1/cards/{id}/", f"/v1/cards/{card_id}/",
+            json={"description": f"Load test edit at {time.time():.3f}"},
+            headers=auth(token)
+        )
+
+    async def social(self, card_id: int, code: str) -> None:
+        # add and remove, so the number of socials per card stays put
+        token: str | None = await self.token(card_id, code)
+        if token is None:
+            return
+        response = await self.client.request(
+            "POST", "/v1/socials/", "/v1/socials/",
+            json={"type": "telegram", "url": f"https://t.me/bench{card_id}", "label": "Telegram"},
+            headers=auth(token)
+        )
+        if response is None or response.status_code != 200:
+            return
+        social_id: int = response.json()["id"]
+        await self.client.request(
+            "DELETE", "/v1/socials/{social_id}/", f"/v1/socials/{social_id}/", headers=auth(token)
+        )
+
+    async def upload(self, card_id: int, code: str) -> None:
+        token: str | None = await self.token(card_id, code)
+        if token is None:
+            return
+        await self.client.request(
+            "POST", "/v1/assets/avatar/", "/v1/assets/avatar/",
+            files={"file": ("avatar.png", self.image, "image/png")},
+            headers=auth(token)
+        )
+
+
+async def create_bucket(env: dict[str, str]) -> None:
+    from aioboto3.session import Session
+    from botocore.exceptions import ClientError
+
+    async with Session().client(
+        "s3",
+        aws_access_key_id=env["S3_ACCESS_KEY"],
+        aws_secret_access_key=env["S3_SECRET_KEY"],
+        endpoint_url=env["S3_DOMAIN"],
+    ) as client:
+        try:
+            await client.create_bucket(Bucket=env["BUCKET_NAME"])
+        except ClientError as e:
+            if e.response["Error"]["Code"] not in {"BucketAlreadyOwnedByYou", "BucketAlreadyExists"}:
+                raise
+
+
+async def seed_cards(client: Client, admin_key: str, count: int, batch: int) -> list[tuple[int, str]]:
+    cards: list[tuple[int, str]] = []
+    for start in range(0, count, batch):
+        payload: dict = {"cards": [
+            {
+                "name": f"Bench {i}",
+                "title": "Engineer",
+                "description": "Synthetic load test card",
+                "phone": f"7{i:010d}",
+                "email": f"bench{i}@example.com",
+                "city": ("Almaty", "Astana", "Shymkent")[i % 3],
+            }
+            for i in range(start, min(start + batch, count))
+        ]}
+        response = await client.request(
+            "POST", "/v1/cards/bulk/", "/v1/cards/bulk/",
+            params={"format": "ndjson"}, json=payload, headers={"X-Admin-Key": admin_key}
+        )
+        if response is None or response.status_code != 200:
+            raise SystemExit(f"bulk create failed: {response.text if response is not None else 'no response'}")
+        cards.extend((row["card_id"], row["code"]) for row in map(json.loads, response.text.splitlines()))
+        print(f"seeded {len(cards)}/{count} cards")
+    return cards
+
+
+async def seed_socials(card_ids: list[int], per_card: int) -> None:
+    from sqlalchemy import text
+    from sqlalchemy.ext.asyncio import create_async_engine
+    from sqlalchemy.pool import NullPool
+
+    from app.core.config import config
+
+    engine = create_async_engine(config.DATABASE_URL, poolclass=NullPool)
+    try:
+        async with engine.begin() as connection:
+            await connection.execute(text("""
+                INSERT INTO card_socials (card_id, type, url, label, order_id, is_visible, created_at)
+                SELECT id, 'telegram', 'https://t.me/card' || id, 'Telegram', n, true, now()
+                FROM unnest(CAST(:ids AS bigint[])) AS id, generate_series(0, :per_card - 1) AS n
+            """), {"ids": card_ids, "per_card": per_card})
+            await connection.execute(text("ANALYZE"))
+    finally:
+        await engine.dispose()
+    print(f"seeded {per_card} socials per card")
+
+
+async def seed_avatars(workload: Workload, count: int, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def upload(card_id: int, code: str) -> None:
+        async with semaphore:
+            await workload.upload(card_id, code)
+
+    # the hot cards first, so taps hit avatars and presigned URLs
+    await asyncio.gather(*(upload(card_id, code) for card_id, code in workload.cards[:count]))
+    print(f"seeded {count} avatars")
+
+
+async def run_users(workload: Workload, users: int, duration: float, warmup: float) -> float:
+    # returns the measured duration, including requests still in flight at the deadline
+    workload.client.measure_from = time.monotonic() + warmup
+    deadline: float = workload.client.measure_from + duration
+
+    async def user() -> None:
+        while time.monotonic() < deadline:
+            await workload.step()
+
+    await asyncio.gather(*(user() for _ in range(users)))
+    return time.monotonic() - workload.client.measure_from
+
+
+def boot(env: dict[str, str], port: int, workers: int) -> subprocess.Popen:
+    subprocess.run([sys.executable, "-m", "app.migrate"], cwd=ROOT_DIR, env=env, check=True)
+    return subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:create_app", "--factory",
+            "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers), "--no-access-log",
+        ],
+        cwd=ROOT_DIR,
+        env=env,
+    )
+
+
+async def wait_ready(base_url: str, timeout: float = 60.0) -> None:
+    deadline: float = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as http:
+        while time.monotonic() < deadline:
+            try:
+                await http.get("/metrics")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.5)
+    raise SystemExit(f"API at {base_url} did not come up within {timeout:.0f}s")
+
+
+async def main(args: argparse.Namespace) -> None:
+    env: dict[str, str] = {**load_env(ENV_FILE), **os.environ}
+    # settings are read at import time by app.core.config
+    os.environ.update(env)
+
+    server: subprocess.Popen | None = None
+    base_url: str = args.base_url or f"http://127.0.0.1:{args.port}"
+    if args.boot:
+        server = boot(env, args.port, args.workers)
+    try:
+        await wait_ready(base_url)
+        limits = httpx.Limits(max_connections=args.users + 16, max_keepalive_connections=args.users + 16)
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.timeout) as http:
+            client = Client(http, Stats())
+            image: bytes = sample_png()
+
+            if args.seed:
+                await create_bucket(env)
+                cards: list[tuple[int, str]] = await seed_cards(
+                    client, env["ADMIN_SECRET"], args.cards, args.batch
+                )
+                Path(args.state).write_text(json.dumps({"cards": cards}))
+                await seed_socials([card_id for card_id, _ in cards], args.socials)
+                await seed_avatars(Workload(client, cards, image), args.avatars, args.users)
+            else:
+                cards = [tuple(card) for card in json.loads(Path(args.state).read_text())["cards"]]
+
+            workload = Workload(client, cards, image)
+            print(f"running {args.users} users for {args.duration:.0f}s after {args.warmup:.0f}s warmup")
+            duration: float = await run_users(workload, args.users, args.duration, args.warmup)
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    report: dict = {
+        "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "base_url": base_url,
+        "users": args.users,
+        "workers": args.workers if args.boot else None,
+        "cards": len(cards),
+        "duration_s": round(duration, 2),
+        "mix": MIX,
+        **client.stats.report(duration),
+    }
+    for endpoint, row in report["endpoints"].items():
+        print(
+            f"{endpoint:40} {row['requests']:>8} req {row['throughput_rps']:>9} rps  "
+            f"p50 {row['p50_ms']:>8}ms  p95 {row['p95_ms']:>8}ms  p99 {row['p99_ms']:>8}ms  errors {row['errors']}"
+        )
+    print(f"total {report['requests']} requests, {report['throughput_rps']} rps")
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the API end to end.")
+    parser.add_argument("--base-url", help="API to test; defaults to the one started by --boot")
+    parser.add_argument("--boot", action="store_true", help="migrate and start create_app() under uvicorn")
+    parser.add_argument("--port", type=int, default=8001, help="port for --boot")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers for --boot")
+    parser.add_argument("--seed", action="store_true", help="seed cards, socials and avatars first")
+    parser.add_argument("--cards", type=int, default=10_000, help="cards to seed")
+    parser.add_argument("--batch", type=int, default=1000, help="cards per bulk request")
+    parser.add_argument("--socials", type=int, default=3, help="socials to seed per card")
+    parser.add_argument("--avatars", type=int, default=200, help="cards to upload an avatar for")
+    parser.add_argument("--state", default=str(BENCH_DIR / "load_state.json"), help="seeded cards and codes")
+    parser.add_argument("--users", type=int, default=32, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=60, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=10, help="unmeasured seconds before that")
+    parser.add_argument("--timeout", type=float, default=30, help="per request timeout in seconds")
+    parser.add_argument("--json", dest="output", help="write the report to this file")
+    asyncio.run(main(parser.parse_args()))
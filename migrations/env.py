@@ -0,0 +1,64 @@
+"""
+Alembic environment.
+
+Runs migrations over the application's async engine URL. An advisory lock
+serializes concurrent runs, e.g. several deploy jobs at once.
+"""
+import asyncio
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core import models  # noqa: F401 - registers tables on Base.metadata
+from app.core.config import config as app_config
+from app.core.models.base import Base
+
+# arbitrary constant shared by every migration run
+MIGRATION_LOCK_ID: int = 7_240_118
+
+alembic_config = context.config
+if alembic_config.config_file_name is not None and alembic_config.attributes.get("configure_logger", True):
+    fileConfig(alembic_config.config_file_name, disable_existing_loggers=False)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline() -> None:
+    context.configure(
+        url=app_config.DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection: Connection) -> None:
+    # session-level lock: it has to survive the commits of autocommit_block()
+    connection.execute(text("SELECT pg_advisory_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+    connection.commit()
+    try:
+        context.configure(connection=connection, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
+    finally:
+        connection.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": MIGRATION_LOCK_ID})
+        connection.commit()
+
+
+async def run_migrations_online() -> None:
+    engine = create_async_engine(app_config.DATABASE_URL, poolclass=NullPool)
+    async with engine.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+    await engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    asyncio.run(run_migrations_online())
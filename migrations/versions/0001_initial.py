@@ -0,0 +1,90 @@
+"""initial schema
+
+Schema as created by Base.metadata.create_all before migrations were
+introduced. Databases created that way are stamped at this revision by
+python -m app.migrate.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 00:00:00
+"""
+from typing import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0001"
+down_revision: str | None = None
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "cards",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("description", sa.String(), nullable=False),
+        sa.Column("phone", sa.String(), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("website", sa.String(), nullable=True),
+        sa.Column("city", sa.String(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "card_assets",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("card_id", sa.Integer(), nullable=False),
+        sa.Column("type", sa.Enum("avatar", "app_icon", name="asset_type"), nullable=False),
+        sa.Column("file_name", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["card_id"], ["cards.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("file_name"),
+    )
+    op.create_index("ix_card_assets_card_id", "card_assets", ["card_id"])
+    op.create_table(
+        "card_socials",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("card_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "type",
+            sa.Enum("instagram", "telegram", "tiktok", "youtube", "custom", name="social_type"),
+            nullable=False
+        ),
+        sa.Column("url", sa.String(), nullable=False),
+        sa.Column("label", sa.String(), nullable=True),
+        sa.Column("order_id", sa.Integer(), nullable=False),
+        sa.Column("icon_asset_id", sa.Integer(), nullable=True),
+        sa.Column("is_visible", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["card_id"], ["cards.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_card_socials_card_id", "card_socials", ["card_id"])
+    op.create_table(
+        "codes",
+        sa.Column("id", sa.BigInteger(), nullable=False),
+        sa.Column("card_id", sa.Integer(), nullable=False),
+        sa.Column("code_hash", sa.String(), nullable=False),
+        sa.Column("is_active", sa.Boolean(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["card_id"], ["cards.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_codes_card_id", "codes", ["card_id"])
+    op.create_index("ix_codes_code_hash", "codes", ["code_hash"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_table("codes")
+    op.drop_table("card_socials")
+    op.drop_table("card_assets")
+    op.drop_table("cards")
+    sa.Enum(name="social_type").drop(op.get_bind())
+    sa.Enum(name="asset_type").drop(op.get_bind())
@@ -0,0 +1,44 @@
+"""asset renditions and S3 outbox
+
+Workers that still ran create_all may already have created s3_outbox, so
+every statement is IF NOT EXISTS.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 00:00:00
+"""
+from typing import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0002"
+down_revision: str | None = "0001"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "card_assets",
+        sa.Column("renditions", sa.JSON(), nullable=True),
+        if_not_exists=True
+    )
+    op.create_table(
+        "s3_outbox",
+        sa.Column("id", sa.BigInteger(), nullable=False),
+        sa.Column("object_name", sa.String(), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("available_at", sa.DateTime(), nullable=False),
+        sa.Column("last_error", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        if_not_exists=True
+    )
+    op.create_index("ix_s3_outbox_available_at", "s3_outbox", ["available_at"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_table("s3_outbox")
+    op.drop_column("card_assets", "renditions")
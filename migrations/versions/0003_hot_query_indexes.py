@@ -0,0 +1,104 @@
+"""composite and partial indexes for hot queries
+
+- card_assets (card_id, type) replaces the card_id index
+- one avatar per card: unique (card_id) where type = 'avatar'
+- codes: unique code_hash among active codes replaces the global unique index
+- card_socials (card_id, order_id) replaces the card_id index
+
+Indexes are built CONCURRENTLY so writes are not blocked on large tables.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 00:00:00
+"""
+from typing import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0003"
+down_revision: str | None = "0002"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # keep the newest avatar if a race ever left two
+    op.execute("""
+        DELETE FROM card_assets AS older
+        USING card_assets AS newer
+        WHERE older.type = 'avatar'
+          AND newer.type = 'avatar'
+          AND older.card_id = newer.card_id
+          AND older.id < newer.id
+    """)
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_card_assets_card_id_type", "card_assets", ["card_id", "type"],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            "uq_card_assets_avatar_card_id", "card_assets", ["card_id"],
+            unique=True,
+            postgresql_where=sa.text("type = 'avatar'"),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            "uq_codes_active_code_hash", "codes", ["code_hash"],
+            unique=True,
+            postgresql_where=sa.text("is_active"),
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            "ix_card_socials_card_id_order_id", "card_socials", ["card_id", "order_id"],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+        op.drop_index(
+            "ix_card_assets_card_id", table_name="card_assets",
+            postgresql_concurrently=True, if_exists=True
+        )
+        op.drop_index(
+            "ix_codes_code_hash", table_name="codes",
+            postgresql_concurrently=True, if_exists=True
+        )
+        op.drop_index(
+            "ix_card_socials_card_id", table_name="card_socials",
+            postgresql_concurrently=True, if_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_card_socials_card_id", "card_socials", ["card_id"],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            "ix_codes_code_hash", "codes", ["code_hash"],
+            unique=True,
+            postgresql_concurrently=True, if_not_exists=True
+        )
+        op.create_index(
+            "ix_card_assets_card_id", "card_assets", ["card_id"],
+            postgresql_concurrently=True, if_not_exists=True
+        )
+
+        op.drop_index(
+            "ix_card_socials_card_id_order_id", table_name="card_socials",
+            postgresql_concurrently=True, if_exists=True
+        )
+        op.drop_index(
+            "uq_codes_active_code_hash", table_name="codes",
+            postgresql_concurrently=True, if_exists=True
+        )
+        op.drop_index(
+            "uq_card_assets_avatar_card_id", table_name="card_assets",
+            postgresql_concurrently=True, if_exists=True
+        )
+        op.drop_index(
+            "ix_card_assets_card_id_type", table_name="card_assets",
+            postgresql_concurrently=True, if_exists=True
+        )